@@ -4,8 +4,18 @@ ADB设备管理模块
 """
 import uiautomator2 as u2
 from adbutils import adb
+from lxml import etree
 from typing import List, Dict, Optional
 import time
+import io
+
+
+# 设备列表中显示的属性：(字段名, getprop属性名)
+_DEVICE_PROPS = (
+    ('model', 'ro.product.model'),
+    ('android_version', 'ro.build.version.release'),
+    ('brand', 'ro.product.brand'),
+)
 
 
 class ADBDeviceManager:
@@ -16,10 +26,14 @@ class ADBDeviceManager:
         self.devices = []
         self.current_device = None
         self.u2_device = None
+        self._screen_size = None  # 屏幕尺寸缓存（连接期间不变）
 
         # 屏幕日志开关
         self.enable_screen_logging = False
         self.screen_log_callback = None  # 日志回调函数
+        # 屏幕日志解析UI层级用的解析器（复用；不需要空白文本和ID索引，不解析实体）
+        self._xml_parser = etree.XMLParser(
+            remove_blank_text=True, collect_ids=False, resolve_entities=False, recover=True)
 
     def get_devices(self) -> List[Dict]:
         """
@@ -42,10 +56,8 @@ class ADBDeviceManager:
                 device_data = {
                     'serial': serial,
                     'state': state,
-                    'model': self._get_device_model(serial),
-                    'android_version': self._get_android_version(serial),
-                    'brand': self._get_device_brand(serial)
                 }
+                device_data.update(self._get_device_props(serial))
                 self.devices.append(device_data)
 
         except Exception as e:
@@ -53,32 +65,25 @@ class ADBDeviceManager:
 
         return self.devices
 
-    def _get_device_model(self, serial: str) -> str:
-        """获取设备型号"""
-        try:
-            device = adb.device(serial=serial)
-            model = device.shell("getprop ro.product.model").strip()
-            return model
-        except:
-            return "Unknown"
+    def _get_device_props(self, serial: str) -> Dict:
+        """
+        获取设备型号、安卓版本和品牌（一次shell调用读取全部属性，而不是每个属性一次往返）
 
-    def _get_android_version(self, serial: str) -> str:
-        """获取安卓版本"""
-        try:
-            device = adb.device(serial=serial)
-            version = device.shell("getprop ro.build.version.release").strip()
-            return version
-        except:
-            return "Unknown"
+        Args:
+            serial: 设备序列号
 
-    def _get_device_brand(self, serial: str) -> str:
-        """获取设备品牌"""
+        Returns:
+            {'model', 'android_version', 'brand'}，获取失败时为"Unknown"
+        """
         try:
             device = adb.device(serial=serial)
-            brand = device.shell("getprop ro.product.brand").strip()
-            return brand
+            output = device.shell("; ".join(f"getprop {prop}" for _, prop in _DEVICE_PROPS))
+            values = [line.strip() for line in output.splitlines()]
+            # 末尾属性为空时那一行可能被去掉，补齐
+            values += [''] * (len(_DEVICE_PROPS) - len(values))
+            return {key: value for (key, _), value in zip(_DEVICE_PROPS, values)}
         except:
-            return "Unknown"
+            return {key: "Unknown" for key, _ in _DEVICE_PROPS}
 
     def connect_device(self, serial: str) -> bool:
         """
@@ -94,6 +99,7 @@ class ADBDeviceManager:
             # 使用uiautomator2连接设备
             self.u2_device = u2.connect(serial)
             self.current_device = serial
+            self._screen_size = None
 
             # 测试连接
             info = self.u2_device.info
@@ -109,6 +115,7 @@ class ADBDeviceManager:
         """断开当前设备连接"""
         self.u2_device = None
         self.current_device = None
+        self._screen_size = None
 
     def get_current_activity(self) -> Optional[str]:
         """
@@ -128,7 +135,7 @@ class ADBDeviceManager:
 
     def get_screen_size(self) -> tuple:
         """
-        获取屏幕尺寸
+        获取屏幕尺寸（首次查询后缓存，避免每次都请求设备信息）
 
         Returns:
             (width, height)
@@ -136,9 +143,15 @@ class ADBDeviceManager:
         if not self.u2_device:
             return (0, 0)
 
+        if self._screen_size:
+            return self._screen_size
+
         try:
             info = self.u2_device.info
-            return (info.get('displayWidth', 0), info.get('displayHeight', 0))
+            size = (info.get('displayWidth', 0), info.get('displayHeight', 0))
+            if size[0] and size[1]:
+                self._screen_size = size
+            return size
         except:
             return (0, 0)
 
@@ -165,16 +178,56 @@ class ADBDeviceManager:
             print(f"截图失败: {e}")
             return None
 
-    def click(self, x: int, y: int):
+    def screenshot_pipe(self, save_path: str = None):
+        """
+        通过adb直接读取screencap的PNG输出截图（不在设备上落盘）
+
+        Args:
+            save_path: 保存路径，如果为None则返回PIL Image对象
+
+        Returns:
+            保存路径、PIL Image对象或None
+        """
+        if not self.current_device:
+            return None
+
+        try:
+            device = adb.device(serial=self.current_device)
+            png_bytes = device.shell(['screencap', '-p'], encoding=None)
+            if not png_bytes:
+                return None
+
+            if save_path:
+                with open(save_path, 'wb') as f:
+                    f.write(png_bytes)
+                return save_path
+            else:
+                from PIL import Image
+                return Image.open(io.BytesIO(png_bytes))
+        except Exception as e:
+            print(f"截图失败: {e}")
+            return None
+
+    def click(self, x: int, y: int) -> bool:
         """
         点击屏幕坐标
 
         Args:
             x: x坐标
             y: y坐标
+
+        Returns:
+            是否已发出点击（坐标超出已知屏幕范围时不点击，也不等待）
         """
         if not self.u2_device:
-            return
+            return False
+
+        # 屏幕尺寸已缓存时才检查，不为此额外查询设备
+        if self._screen_size:
+            width, height = self._screen_size
+            if not (0 <= x < width and 0 <= y < height):
+                print(f"点击坐标超出屏幕范围: ({x}, {y})，屏幕 {width}x{height}")
+                return False
 
         try:
             self.u2_device.click(x, y)
@@ -182,9 +235,11 @@ class ADBDeviceManager:
 
             # 记录屏幕状态
             self._log_screen_state(f"点击坐标({x}, {y})")
+            return True
 
         except Exception as e:
             print(f"点击失败: {e}")
+            return False
 
     def swipe(self, fx: int, fy: int, tx: int, ty: int, duration: float = 0.5):
         """
@@ -274,23 +329,32 @@ class ADBDeviceManager:
             log_lines.append("="*80)
 
             # 提取关键信息
-            from lxml import etree
             try:
-                root = etree.fromstring(xml.encode('utf-8'))
-
-                # 统计节点信息
-                all_nodes = root.xpath('//node')
-                clickable_nodes = root.xpath('//node[@clickable="true"]')
-                text_nodes = root.xpath('//node[@text and string-length(@text) > 0]')
+                root = etree.fromstring(xml.encode('utf-8'), self._xml_parser)
+
+                # 统计节点信息（一次遍历完成计数，只保留要输出的前几个节点）
+                total_count = clickable_count = text_count = 0
+                clickable_nodes = []
+                text_nodes = []
+                for node in root.iter('node'):
+                    total_count += 1
+                    if node.get('clickable') == 'true':
+                        clickable_count += 1
+                        if clickable_count <= 10:
+                            clickable_nodes.append(node)
+                    if node.get('text'):
+                        text_count += 1
+                        if text_count <= 20:
+                            text_nodes.append(node)
 
                 log_lines.append(f"节点统计:")
-                log_lines.append(f"  - 总节点数: {len(all_nodes)}")
-                log_lines.append(f"  - 可点击节点: {len(clickable_nodes)}")
-                log_lines.append(f"  - 包含文本节点: {len(text_nodes)}")
+                log_lines.append(f"  - 总节点数: {total_count}")
+                log_lines.append(f"  - 可点击节点: {clickable_count}")
+                log_lines.append(f"  - 包含文本节点: {text_count}")
 
                 # 提取可见的文本内容（前20个）
                 log_lines.append(f"\n可见文本内容 (前20个):")
-                for idx, node in enumerate(text_nodes[:20], 1):
+                for idx, node in enumerate(text_nodes, 1):
                     text = node.get('text', '').strip()
                     bounds = node.get('bounds', '')
                     if text:
@@ -298,7 +362,7 @@ class ADBDeviceManager:
 
                 # 提取可点击元素（前10个）
                 log_lines.append(f"\n可点击元素 (前10个):")
-                for idx, node in enumerate(clickable_nodes[:10], 1):
+                for idx, node in enumerate(clickable_nodes, 1):
                     text = node.get('text', '').strip()
                     content_desc = node.get('content-desc', '').strip()
                     resource_id = node.get('resource-id', '').strip()
@@ -336,7 +400,8 @@ class ADBDeviceManager:
             return None
 
         try:
-            # dump_hierarchy返回XML字符串
+            # dump_hierarchy经设备上常驻的uiautomator2服务直接返回XML字符串，
+            # 不经过 uiautomator dump 写文件再 adb pull；另起原生dump会与该服务抢占UiAutomation连接
             xml = self.u2_device.dump_hierarchy()
             return xml
         except Exception as e:
@@ -3,6 +3,7 @@
 支持层级分类的增删改查操作
 """
 import sqlite3
+from datetime import datetime
 from typing import List, Optional, Dict, Tuple
 from pathlib import Path
 
@@ -95,7 +96,6 @@ class CategoryManager:
             table_name = f"merchants_{path.replace('/', '_').replace(' ', '_').lower()}"
 
             # 插入分类
-            from datetime import datetime
             self.cursor.execute('''
                 INSERT INTO categories_tree (name, parent_id, level, path, table_name, create_time)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -4,7 +4,9 @@
 """
 import sys
 import os
+import csv
 import hashlib
+import traceback
 import yaml
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -371,7 +373,6 @@ class DataViewerWindow(QMainWindow):
 
     def _build_tree_items(self, nodes, parent):
         """递归构建树形项"""
-        from category_manager import CategoryNode
         for node in nodes:
             # 获取商家数量 - 使用实际数据库查询结果的行数
             merchants = self.db_manager.get_merchants_by_category(node.path)
@@ -458,8 +459,6 @@ class DataViewerWindow(QMainWindow):
 
         if filename:
             try:
-                import csv
-
                 with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
                     writer = csv.writer(f)
 
@@ -648,9 +647,10 @@ class DataViewerWindow(QMainWindow):
         delete_action.triggered.connect(self.delete_selected_merchants)
         menu.addAction(delete_action)
 
-        # 批量删除
-        if len(set(item.row() for item in selected_rows)) > 1:
-            delete_all_action = QAction(f"批量删除 ({len(set(item.row() for item in selected_rows))} 项)", self)
+        # 批量删除（选中的是单元格，按行号去重后计数）
+        selected_row_count = len({item.row() for item in selected_rows})
+        if selected_row_count > 1:
+            delete_all_action = QAction(f"批量删除 ({selected_row_count} 项)", self)
             delete_all_action.triggered.connect(self.delete_selected_merchants)
             menu.addAction(delete_all_action)
 
@@ -666,7 +666,8 @@ class DataViewerWindow(QMainWindow):
 
     def delete_selected_merchants(self):
         """删除选中的商家"""
-        selected_rows = list(set(item.row() for item in self.table.selectedItems()))
+        # 选中的是单元格，按行号去重；按行号倒序删除（避免索引变化）
+        selected_rows = sorted({item.row() for item in self.table.selectedItems()}, reverse=True)
 
         if not selected_rows:
             DebugMessageBox.warning(self, "警告", "请先选择要删除的商家")
@@ -686,9 +687,6 @@ class DataViewerWindow(QMainWindow):
             return
 
         try:
-            # 按行号倒序删除（避免索引变化）
-            selected_rows.sort(reverse=True)
-
             # 使用保存的表名
             table_name = self.current_table_name
 
@@ -884,7 +882,6 @@ class DataViewerWindow(QMainWindow):
 
         except Exception as e:
             DebugMessageBox.critical(self, "错误", f"清除数据失败:\n{str(e)}")
-            import traceback
             traceback.print_exc()
 
 
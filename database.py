@@ -9,6 +9,10 @@ from datetime import datetime
 from typing import List, Dict, Optional
 
 
+# 表名中不允许的字符（字母、数字、下划线和中文以外）
+_RE_TABLE_NAME_UNSAFE = re.compile(r'[^\w\u4e00-\u9fff]+')
+
+
 class DatabaseManager:
     """数据库管理类"""
 
@@ -42,7 +46,7 @@ class DatabaseManager:
 
         # 只保留字母、数字、下划线和中文字符
         # 使用正则表达式移除其他特殊字符
-        safe_name = re.sub(r'[^\w\u4e00-\u9fff]+', '_', safe_name)
+        safe_name = _RE_TABLE_NAME_UNSAFE.sub('_', safe_name)
 
         # 移除开头和结尾的下划线
         safe_name = safe_name.strip('_')
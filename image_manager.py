@@ -4,6 +4,7 @@
 """
 import os
 import time
+import shutil
 import hashlib
 from typing import List, Dict
 from PIL import Image
@@ -248,7 +249,6 @@ class ImageManager:
             )
 
             if os.path.exists(merchant_dir):
-                import shutil
                 shutil.rmtree(merchant_dir)
                 print(f"已删除商家图片目录: {merchant_dir}")
                 return True
@@ -277,7 +277,6 @@ class ImageManager:
             )
 
             if os.path.exists(category_dir):
-                import shutil
                 shutil.rmtree(category_dir)
                 print(f"已删除分类图片目录: {category_dir}")
                 return True
@@ -10,11 +10,260 @@
 5. 调试模式支持
 """
 import re
+import threading
+import traceback
+from functools import lru_cache
 from typing import List, Dict, Optional
 from lxml import etree
 import yaml
 
 
+# 复用的XML解析器：UI层级只读属性，不需要空白文本和ID索引
+# recover=True：界面切换时偶尔拿到截断的dump，尽量解析出已有部分而不是直接抛错
+# 每个线程一个解析器：lxml对同一解析器的并发使用会加锁串行，多设备并行采集时互相等待
+_parser_local = threading.local()
+
+
+def _get_xml_parser() -> etree.XMLParser:
+    """
+    获取当前线程复用的XML解析器
+
+    Returns:
+        XMLParser实例
+    """
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = _parser_local.parser = etree.XMLParser(
+            remove_blank_text=True, remove_comments=True, collect_ids=False, huge_tree=True, recover=True)
+    return parser
+
+
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_RECORD_TAG = re.compile(r'^收录\d+[年个月天]')
+_RE_ADDRESS_NUMBER = re.compile(r'[A-Z]\d+-\d+号|\d+期\d+-\d+')
+_RE_TIME_PREFIX = re.compile(r'.{0,3}\d{1,2}:\d{2}')
+_RE_DISTANCE = re.compile(r'^\d+\.?\d*\s?(公里|km|米|m|分钟)$')
+
+# 广告关键词
+_AD_KEYWORDS = (
+    '高德红包', '优惠', '券', '领取', '满减', '折扣', '减',
+    '刚刚浏览', '大家还在搜', '推荐', '榜单', '服务推荐',
+    '扫街榜', '爆款', '精选', '新客', '满', '已领取',
+    '鲜花上门配送', '上门配送', '配送服务', '买花榜',
+    '鲜花配送', '送货上门', '配送推荐', '服务', '推荐商家',
+    # 强化过滤：组合词
+    '场地布置', '气球派对', '开业花篮', '绿植',
+    '（昆明店）', '（成都店）', '（西安店）',  # 连锁广告特征
+    '馨爱鲜花'  # 明确的广告商家
+)
+
+# 排除关键词
+_EXCLUDED_KEYWORDS = (
+    '搜索', '导航', '路线', '附近', '更多', '分享', '收藏',
+    '大家还在搜', '根据当前位置推荐', '附近更多', '查看',
+    '去过', '想去', '人均', '公里', 'km', 'm'
+)
+
+# 标签关键词（避免将标签当作商家名）
+_TAG_KEYWORDS = (
+    '收录', '入驻', '营业', '评分', '评价', '超棒',
+    '很好', '好', '分', '星', '人去过', '想去', '收藏'
+)
+
+# 商家卡片候选节点：RecyclerView下可点击的ViewGroup（主要）、带content-desc的可点击节点（备用）
+_XPATH_RV_CARDS = ('//node[@class="androidx.recyclerview.widget.RecyclerView"]'
+                   '//node[@class="android.view.ViewGroup" and @clickable="true" and @bounds]')
+_XPATH_DESC_CARDS = '//node[@content-desc and @clickable="true" and @bounds]'
+_XP_RV_CARDS = etree.XPath(_XPATH_RV_CARDS)
+_XP_DESC_CARDS = etree.XPath(_XPATH_DESC_CARDS)
+# 两者的并集：按文档顺序返回且自动去掉同时满足两个条件的重复节点，一次遍历即可
+_XP_CARD_CANDIDATES = etree.XPath(f'{_XPATH_RV_CARDS} | {_XPATH_DESC_CARDS}')
+
+# 卡片内非空text且带bounds的文本节点（相对路径）
+_XP_CARD_TEXT_NODES = etree.XPath('.//node[@text and string-length(@text) > 0 and @bounds]')
+
+
+def _split_bounds(bounds_str: str) -> Optional[tuple]:
+    """
+    用字符串切分解析bounds（格式固定，比正则快）
+
+    校验与 re.match(r'\\[(\\d+),(\\d+)\\]\\[(\\d+),(\\d+)\\]') 一致：每个坐标必须是纯数字，
+    不接受正负号、空格或下划线（int()本身会放过这些）
+
+    Args:
+        bounds_str: bounds字符串，格式 "[x1,y1][x2,y2]"
+
+    Returns:
+        (x1, y1, x2, y2) 元组，格式不合法时返回None
+    """
+    if not bounds_str or bounds_str[0] != '[':
+        return None
+
+    i = bounds_str.find('][')
+    if i < 0:
+        return None
+    j = bounds_str.find(']', i + 2)
+    if j < 0:
+        return None
+
+    first = bounds_str[1:i].split(',')
+    second = bounds_str[i + 2:j].split(',')
+    if len(first) != 2 or len(second) != 2:
+        return None
+
+    coords = first + second
+    for part in coords:
+        if not part.isdecimal():
+            return None
+    x1, y1, x2, y2 = coords
+    return int(x1), int(y1), int(x2), int(y2)
+
+
+def _strip_html(text: str) -> str:
+    """
+    去除文本中的HTML标签（绝大多数节点文本不含标签，先做廉价判断再跑正则）
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        去除标签后的文本
+    """
+    return _RE_HTML_TAG.sub('', text) if '<' in text else text
+
+
+# 以下卡片文本判断都是文本的纯函数：滚动翻页时同样的广告、标签、距离文本反复出现，按文本缓存结果
+@lru_cache(maxsize=2048)
+def _is_excluded_text(text: str) -> bool:
+    """
+    判断是否是需要排除的文本
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        是否需要排除
+    """
+    for keyword in _EXCLUDED_KEYWORDS:
+        if keyword in text:
+            return True
+    return False
+
+
+@lru_cache(maxsize=2048)
+def _is_tag_text(text: str) -> bool:
+    """
+    判断是否是标签文本（避免将标签当作商家名）
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        是否为标签
+    """
+    # 🆕 关键过滤：排除"收录X年"、"收录X个月"等时间标签
+    if _RE_RECORD_TAG.match(text):
+        return True  # 匹配: 收录1年、收录2年、收录6个月
+
+    # 长度过短（<=3字符）的标签
+    if len(text) <= 3:
+        for keyword in _TAG_KEYWORDS:
+            if keyword in text:
+                return True
+
+    # 完全匹配标签关键词
+    for keyword in ['收录', '入驻商家', '营业中', '评分', '评价']:
+        if text == keyword or text.endswith(keyword):
+            return True
+
+    return False
+
+
+@lru_cache(maxsize=2048)
+def _is_address_text(text: str) -> bool:
+    """
+    判断是否是地址信息（2025-01-16新增）
+
+    地址特征：
+    - 包含区/县/市/省
+    - 包含路/街/道/巷/大棚/棚/号
+    - 包含距离单位（公里/km/米/m）
+    - 包含时间描述（驾车/步行/分钟）
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        是否为地址信息
+    """
+    # 地址关键词（行政区划）
+    address_keywords_admin = ['区', '县', '市', '省', '镇', '乡', '村']
+
+    # 地址关键词（道路建筑）
+    address_keywords_road = ['路', '街', '道', '巷', '弄', '里', '大棚', '棚', '号', '栋', '楼', '层', '室', '幢']
+
+    # 距离和时间关键词
+    distance_keywords = ['公里', 'km', '米', 'm', '驾车', '步行', '分钟', '小时']
+
+    # 计数命中的关键词类型
+    has_admin = any(keyword in text for keyword in address_keywords_admin)
+    has_road = any(keyword in text for keyword in address_keywords_road)
+    has_distance = any(keyword in text for keyword in distance_keywords)
+
+    # 判断逻辑：
+    # 1. 同时包含行政区划 + 道路建筑 → 肯定是地址
+    if has_admin and has_road:
+        return True
+
+    # 2. 包含距离/时间描述 → 肯定是地址或距离信息
+    if has_distance:
+        return True
+
+    # 3. 包含"大棚"、"草莓地"等特殊地址词
+    if any(keyword in text for keyword in ['大棚', '草莓地', '市场', '交易中心']):
+        # 但如果是"XX市场"、"XX交易中心"作为商家名的一部分，需要判断
+        # 如果文本很短（<15字符）且只包含一个关键词，可能是商家名
+        if len(text) < 15:
+            keyword_count = sum(1 for k in ['大棚', '草莓地', '市场', '交易中心'] if k in text)
+            if keyword_count == 1 and ('市场' in text or '交易中心' in text):
+                # 可能是"斗南花卉市场"这种商家名
+                return False
+        return True
+
+    # 4. 包含地址编号模式（如"A35-38号"、"2期487-488"）
+    if _RE_ADDRESS_NUMBER.search(text):
+        return True
+
+    return False
+
+
+@lru_cache(maxsize=2048)
+def _is_advertisement(text: str) -> bool:
+    """
+    判断是否是广告内容
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        是否为广告
+    """
+    # 检查广告关键词
+    for keyword in _AD_KEYWORDS:
+        if keyword in text:
+            return True
+
+    # 排除时间格式（如 "半夜12:12"）
+    if _RE_TIME_PREFIX.match(text):
+        return True
+
+    # 排除纯数字加单位（如 "5.8公里"）
+    if _RE_DISTANCE.match(text):
+        return True
+
+    return False
+
+
 class MerchantCardLocator:
     """商家卡片定位器"""
 
@@ -40,32 +289,6 @@ class MerchantCardLocator:
         if 'safe_y_max_ratio' in self.params:
             self.params['safe_y_max'] = int(screen_height * self.params['safe_y_max_ratio'])
 
-        # 广告关键词列表
-        self.ad_keywords = [
-            '高德红包', '优惠', '券', '领取', '满减', '折扣', '减',
-            '刚刚浏览', '大家还在搜', '推荐', '榜单', '服务推荐',
-            '扫街榜', '爆款', '精选', '新客', '满', '已领取',
-            '鲜花上门配送', '上门配送', '配送服务', '买花榜',
-            '鲜花配送', '送货上门', '配送推荐', '服务', '推荐商家',
-            # 强化过滤：组合词
-            '场地布置', '气球派对', '开业花篮', '绿植',
-            '（昆明店）', '（成都店）', '（西安店）',  # 连锁广告特征
-            '馨爱鲜花'  # 明确的广告商家
-        ]
-
-        # 排除关键词列表
-        self.excluded_keywords = [
-            '搜索', '导航', '路线', '附近', '更多', '分享', '收藏',
-            '大家还在搜', '根据当前位置推荐', '附近更多', '查看',
-            '去过', '想去', '人均', '公里', 'km', 'm'
-        ]
-
-        # 标签关键词列表（避免将标签当作商家名）
-        self.tag_keywords = [
-            '收录', '入驻', '营业', '评分', '评价', '超棒',
-            '很好', '好', '分', '星', '人去过', '想去', '收藏'
-        ]
-
     def _load_config(self, config_path: str) -> Dict:
         """
         加载配置文件
@@ -137,73 +360,61 @@ class MerchantCardLocator:
 
         try:
             # 解析XML
-            root = etree.fromstring(xml_content.encode('utf-8'))
-
-            # 策略1：从RecyclerView中查找（主要方法）
-            recyclerview_cards = self._extract_from_recyclerview(root, debug_mode)
-
-            # 策略2：从content-desc属性查找（备用方法）
-            contentdesc_cards = self._extract_from_contentdesc(root, debug_mode)
-
-            # 合并去重
-            all_cards = self._merge_cards(recyclerview_cards, contentdesc_cards)
-
-            # 按Y坐标排序并添加索引
-            all_cards.sort(key=lambda c: c['bounds']['y1'])
-            for idx, card in enumerate(all_cards):
-                card['index'] = idx
-
-            if debug_mode:
-                print(f"\n✓ 共识别 {len(all_cards)} 个商家卡片")
-                for card in all_cards:
-                    self._print_card_info(card)
-
-            return all_cards
-
+            if isinstance(xml_content, str):
+                xml_content = xml_content.encode('utf-8')
+            root = etree.fromstring(xml_content, _get_xml_parser())
         except Exception as e:
             if debug_mode:
                 print(f"✗ 解析XML失败: {e}")
-            import traceback
             traceback.print_exc()
             return []
 
-    def _extract_from_recyclerview(self, root, debug_mode: bool = False) -> List[Dict]:
+        return self.find_merchant_cards_root(root, debug_mode)
+
+    def find_merchant_cards_root(self, root, debug_mode: bool = False) -> List[Dict]:
         """
-        从RecyclerView结构中提取商家卡片
+        从已解析的XML根节点中查找所有商家卡片（调用方已有解析树时使用，避免重复解析）
 
         Args:
             root: XML根节点
             debug_mode: 是否启用调试模式
 
         Returns:
-            商家卡片列表
+            商家卡片列表，格式同find_merchant_cards
         """
-        cards = []
+        if root is None:
+            if debug_mode:
+                print("✗ XML解析失败")
+            return []
 
-        # 查找RecyclerView节点
-        recyclerviews = root.xpath('//node[@class="androidx.recyclerview.widget.RecyclerView"]')
+        try:
+            # RecyclerView卡片 + content-desc卡片，一次XPath并集查询
+            candidate_cards = self._extract_card_candidates(root, debug_mode)
 
-        if debug_mode:
-            print(f"\n🔍 策略1: 从RecyclerView查找")
-            print(f"   找到 {len(recyclerviews)} 个RecyclerView")
+            # 去重
+            all_cards = self._merge_cards(candidate_cards)
 
-        for recyclerview in recyclerviews:
-            # 查找其下的ViewGroup节点
-            viewgroups = recyclerview.xpath('.//node[@class="android.view.ViewGroup" and @clickable="true" and @bounds]')
+            # 按Y坐标排序并添加索引
+            all_cards.sort(key=lambda c: c['bounds']['y1'])
+            for idx, card in enumerate(all_cards):
+                card['index'] = idx
 
             if debug_mode:
-                print(f"   RecyclerView下有 {len(viewgroups)} 个可点击ViewGroup")
+                print(f"\n✓ 共识别 {len(all_cards)} 个商家卡片")
+                for card in all_cards:
+                    self._print_card_info(card)
 
-            for idx, viewgroup in enumerate(viewgroups):
-                card = self._parse_single_card(viewgroup, idx, debug_mode)
-                if card:
-                    cards.append(card)
+            return all_cards
 
-        return cards
+        except Exception as e:
+            if debug_mode:
+                print(f"✗ 识别商家卡片失败: {e}")
+            traceback.print_exc()
+            return []
 
-    def _extract_from_contentdesc(self, root, debug_mode: bool = False) -> List[Dict]:
+    def _extract_card_candidates(self, root, debug_mode: bool = False) -> List[Dict]:
         """
-        从content-desc属性提取商家卡片（备用方法）
+        提取商家卡片（RecyclerView下的ViewGroup + 带content-desc的可点击节点）
 
         Args:
             root: XML根节点
@@ -214,12 +425,11 @@ class MerchantCardLocator:
         """
         cards = []
 
-        # 查找所有带content-desc且可点击的节点
-        nodes = root.xpath('//node[@content-desc and @clickable="true" and @bounds]')
+        nodes = _XP_CARD_CANDIDATES(root)
 
         if debug_mode:
-            print(f"\n🔍 策略2: 从content-desc查找")
-            print(f"   找到 {len(nodes)} 个带content-desc的可点击节点")
+            print(f"\n🔍 查找商家卡片（RecyclerView + content-desc）")
+            print(f"   找到 {len(nodes)} 个候选节点")
 
         for idx, node in enumerate(nodes):
             card = self._parse_single_card(node, idx, debug_mode)
@@ -266,7 +476,7 @@ class MerchantCardLocator:
             return None
 
         # 第4步：广告过滤
-        if self._is_advertisement(merchant_name):
+        if _is_advertisement(merchant_name):
             if debug_mode:
                 print(f"   ✗ 节点[{index}] 跳过广告: {merchant_name}")
             return None
@@ -303,15 +513,11 @@ class MerchantCardLocator:
         Returns:
             bounds字典 {'x1', 'y1', 'x2', 'y2', 'width', 'height'}，解析失败返回None
         """
-        if not bounds_str:
-            return None
-
-        # 匹配格式 [x1,y1][x2,y2]
-        match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds_str)
-        if not match:
+        coords = _split_bounds(bounds_str)
+        if coords is None:
             return None
 
-        x1, y1, x2, y2 = map(int, match.groups())
+        x1, y1, x2, y2 = coords
 
         return {
             'x1': x1,
@@ -380,15 +586,13 @@ class MerchantCardLocator:
         card_height = bounds['height']
 
         # 查找所有文本节点
-        text_nodes = node.xpath('.//node[@text and string-length(@text) > 0 and @bounds]')
+        text_nodes = _XP_CARD_TEXT_NODES(node)
 
         candidate_names = []
 
         for text_node in text_nodes:
-            text = text_node.get('text', '').strip()
-
-            # 清理HTML标签
-            clean_text = re.sub(r'<[^>]+>', '', text).strip()
+            # 清理HTML标签（同时去除首尾空白）
+            clean_text = _strip_html(text_node.get('text', '')).strip()
 
             if not clean_text or len(clean_text) < 3:
                 continue
@@ -411,11 +615,11 @@ class MerchantCardLocator:
                 continue  # 包含3个以上商品词，是商品名
 
             # 关键过滤4：排除地址和距离
-            if self._is_address_text(clean_text):
+            if _is_address_text(clean_text):
                 continue
-            if self._is_excluded_text(clean_text):
+            if _is_excluded_text(clean_text):
                 continue
-            if self._is_tag_text(clean_text):
+            if _is_tag_text(clean_text):
                 continue
 
             # 关键过滤5：Y轴位置（应该在卡片上半部分）
@@ -457,129 +661,6 @@ class MerchantCardLocator:
 
         return best_name
 
-    def _is_excluded_text(self, text: str) -> bool:
-        """
-        判断是否是需要排除的文本
-
-        Args:
-            text: 文本内容
-
-        Returns:
-            是否需要排除
-        """
-        for keyword in self.excluded_keywords:
-            if keyword in text:
-                return True
-        return False
-
-    def _is_tag_text(self, text: str) -> bool:
-        """
-        判断是否是标签文本（避免将标签当作商家名）
-
-        Args:
-            text: 文本内容
-
-        Returns:
-            是否为标签
-        """
-        # 🆕 关键过滤：排除"收录X年"、"收录X个月"等时间标签
-        if re.match(r'^收录\d+[年个月天]', text):
-            return True  # 匹配: 收录1年、收录2年、收录6个月
-
-        # 长度过短（<=3字符）的标签
-        if len(text) <= 3:
-            for keyword in self.tag_keywords:
-                if keyword in text:
-                    return True
-
-        # 完全匹配标签关键词
-        for keyword in ['收录', '入驻商家', '营业中', '评分', '评价']:
-            if text == keyword or text.endswith(keyword):
-                return True
-
-        return False
-
-    def _is_address_text(self, text: str) -> bool:
-        """
-        判断是否是地址信息（2025-01-16新增）
-
-        地址特征：
-        - 包含区/县/市/省
-        - 包含路/街/道/巷/大棚/棚/号
-        - 包含距离单位（公里/km/米/m）
-        - 包含时间描述（驾车/步行/分钟）
-
-        Args:
-            text: 文本内容
-
-        Returns:
-            是否为地址信息
-        """
-        # 地址关键词（行政区划）
-        address_keywords_admin = ['区', '县', '市', '省', '镇', '乡', '村']
-
-        # 地址关键词（道路建筑）
-        address_keywords_road = ['路', '街', '道', '巷', '弄', '里', '大棚', '棚', '号', '栋', '楼', '层', '室', '幢']
-
-        # 距离和时间关键词
-        distance_keywords = ['公里', 'km', '米', 'm', '驾车', '步行', '分钟', '小时']
-
-        # 计数命中的关键词类型
-        has_admin = any(keyword in text for keyword in address_keywords_admin)
-        has_road = any(keyword in text for keyword in address_keywords_road)
-        has_distance = any(keyword in text for keyword in distance_keywords)
-
-        # 判断逻辑：
-        # 1. 同时包含行政区划 + 道路建筑 → 肯定是地址
-        if has_admin and has_road:
-            return True
-
-        # 2. 包含距离/时间描述 → 肯定是地址或距离信息
-        if has_distance:
-            return True
-
-        # 3. 包含"大棚"、"草莓地"等特殊地址词
-        if any(keyword in text for keyword in ['大棚', '草莓地', '市场', '交易中心']):
-            # 但如果是"XX市场"、"XX交易中心"作为商家名的一部分，需要判断
-            # 如果文本很短（<15字符）且只包含一个关键词，可能是商家名
-            if len(text) < 15:
-                keyword_count = sum(1 for k in ['大棚', '草莓地', '市场', '交易中心'] if k in text)
-                if keyword_count == 1 and ('市场' in text or '交易中心' in text):
-                    # 可能是"斗南花卉市场"这种商家名
-                    return False
-            return True
-
-        # 4. 包含地址编号模式（如"A35-38号"、"2期487-488"）
-        if re.search(r'[A-Z]\d+-\d+号', text) or re.search(r'\d+期\d+-\d+', text):
-            return True
-
-        return False
-
-    def _is_advertisement(self, text: str) -> bool:
-        """
-        判断是否是广告内容
-
-        Args:
-            text: 文本内容
-
-        Returns:
-            是否为广告
-        """
-        # 检查广告关键词
-        for keyword in self.ad_keywords:
-            if keyword in text:
-                return True
-
-        # 排除时间格式（如 "半夜12:12"）
-        if re.match(r'.{0,3}\d{1,2}:\d{2}', text):
-            return True
-
-        # 排除纯数字加单位（如 "5.8公里"）
-        if re.match(r'^\d+\.?\d*\s?(公里|km|米|m|分钟)$', text):
-            return True
-
-        return False
-
     def _calculate_safe_click_point(self, bounds: Dict) -> Dict:
         """
         计算安全点击位置
@@ -681,31 +762,28 @@ class MerchantCardLocator:
 
         return confidence
 
-    def _merge_cards(self, cards1: List[Dict], cards2: List[Dict]) -> List[Dict]:
+    def _merge_cards(self, cards: List[Dict]) -> List[Dict]:
         """
-        合并两个卡片列表，去除重复项
+        卡片列表去重（同一卡片可能由ViewGroup和其content-desc子节点各识别一次）
 
         去重策略：
         1. 使用Y轴位置 + 商家名称作为唯一标识
         2. 优先选择宽度更大的卡片（置信度更高）
 
         Args:
-            cards1: 卡片列表1（优先级高）
-            cards2: 卡片列表2
+            cards: 卡片列表（按文档顺序）
 
         Returns:
-            合并后的卡片列表
+            去重后的卡片列表
         """
-        merged = []
         seen_cards = {}  # key: (y轴, 商家名), value: card
 
         # 🆕 修复：使用Y轴+名称去重，同一Y轴同名商家只保留一个
-        all_cards = cards1 + cards2
-
-        for card in all_cards:
+        for card in cards:
             # 使用Y轴和商家名作为唯一标识
             # Y轴允许10像素误差（同一行）
-            y_key = card['bounds']['y1'] // 10 * 10  # 向下取整到10的倍数
+            bounds = card['bounds']
+            y_key = bounds['y1'] // 10 * 10  # 向下取整到10的倍数
             card_key = (y_key, card['name'])
 
             if card_key not in seen_cards:
@@ -715,11 +793,10 @@ class MerchantCardLocator:
                 # 已经有相同位置和名称的卡片，比较宽度
                 existing_card = seen_cards[card_key]
                 # 优先选择宽度更大的卡片（更完整）
-                if card['bounds']['width'] > existing_card['bounds']['width']:
+                if bounds['width'] > existing_card['bounds']['width']:
                     seen_cards[card_key] = card
 
-        merged = list(seen_cards.values())
-        return merged
+        return list(seen_cards.values())
 
     def _print_card_info(self, card: Dict):
         """
@@ -728,8 +805,10 @@ class MerchantCardLocator:
         Args:
             card: 卡片信息字典
         """
+        bounds = card['bounds']
+        click_point = card['click_point']
         print(f"\n  [{card.get('index', '?')}] {card['name']}")
-        print(f"      Bounds: [{card['bounds']['x1']},{card['bounds']['y1']}][{card['bounds']['x2']},{card['bounds']['y2']}]")
-        print(f"      Size: {card['bounds']['width']}x{card['bounds']['height']} (宽x高)")
-        print(f"      Click: ({card['click_point']['x']}, {card['click_point']['y']})")
+        print(f"      Bounds: [{bounds['x1']},{bounds['y1']}][{bounds['x2']},{bounds['y2']}]")
+        print(f"      Size: {bounds['width']}x{bounds['height']} (宽x高)")
+        print(f"      Click: ({click_point['x']}, {click_point['y']})")
         print(f"      Confidence: {card['confidence']:.2%}")
@@ -11,16 +11,271 @@
 6. 调试模式支持
 """
 import time
+import heapq
 import re
 import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from adb_manager import ADBDeviceManager
 from lxml import etree
-from merchant_card_locator import MerchantCardLocator
+from merchant_card_locator import (MerchantCardLocator, _XP_DESC_CARDS, _XP_RV_CARDS, _get_xml_parser,
+                                   _split_bounds, _strip_html)
 from merchant_detail_locator import MerchantDetailLocator
 import yaml
 
 
+# UI层级缓存有效期（秒）：超过后即使没有点击也重新拉取，防止界面自行变化（动画、弹窗）时用到旧数据
+_UI_CACHE_TTL = 0.3
+
+# 等待界面稳定：点击后先等待的最短时间、两次拉取UI层级的间隔、最长等待时间（秒）
+_UI_SETTLE_MIN_WAIT = 0.5
+_UI_SETTLE_POLL = 0.15
+
+# 页面检测关键词
+_DETAIL_AD_KEYWORDS = ('推荐', '服务推荐', '上门配送', '配送服务')
+_DETAIL_PAGE_KEYWORDS = ('电话', '导航', '路线', '筛选', '排序') + _DETAIL_AD_KEYWORDS
+_DIALER_KEYWORDS = ('拨号', '通话', '呼叫', '联系人', '最近通话', '通讯录')
+_AMAP_KEYWORDS = ('商家', '导航', '路线', '地址', '详情')
+_SUPPLEMENT_KEYWORDS = ('补充电话', '暂无电话', '未提供电话', '添加电话')
+_END_INDICATORS = ('没有更多', '已经到底', '没有更多内容', '暂无更多', '到底了', '就这些了')
+
+# resource-id定位：系统UI命名空间和商家名的resource-id关键词（小写匹配）
+_SYSTEM_UI_NAMESPACES = ('com.android.systemui:', 'android:id/')
+_RESID_NAME_KEYWORDS = ('title', 'name', 'merchant', 'shop')
+# 包含"电话"但不是拨号按钮的文字
+_PHONE_BUTTON_EXCLUDED = ('补充电话', '添加电话', '暂无电话', '未提供电话', '电话预定')
+# 关键词兜底识别地址时使用的特征字（单字字符类，一次扫描）
+_RE_ADDRESS_HINT = re.compile('[区路街号道巷]')
+
+# 文本分类关键词
+_EXCLUDED_KEYWORDS = (
+    '搜索', '导航', '路线', '附近', '更多', '分享', '收藏',
+    '大家还在搜', '根据当前位置推荐', '附近更多', '查看',
+    '去过', '想去', '人均', '公里', 'km', 'm'
+)
+_AD_KEYWORDS = (
+    '高德红包', '优惠', '券', '领取', '满减', '折扣', '减',
+    '刚刚浏览', '最近浏览', '大家还在搜', '推荐', '榜单', '服务推荐',
+    '扫街榜', '爆款', '精选', '新客', '满', '已领取',
+    '鲜花上门配送', '上门配送', '配送服务', '买花榜',
+    '鲜花配送', '送货上门', '配送推荐', '服务', '推荐商家',
+    # 强化过滤：组合词
+    '场地布置', '气球派对', '开业花篮', '绿植',
+    '（昆明店）', '（成都店）', '（西安店）',  # 连锁广告特征
+    '馨爱鲜花'  # 明确的广告商家
+)
+_DISTANCE_KEYWORDS = ('公里', 'km', '米', 'm', '驾车', '步行', '分钟', '小时')
+_SPECIAL_ADDRESS_KEYWORDS = ('大棚', '草莓地', '市场', '交易中心')
+
+# 关键词列表预编译为单个正则，一次C层扫描代替逐个关键词的 in 判断
+_RE_EXCLUDED = re.compile('|'.join(map(re.escape, _EXCLUDED_KEYWORDS)))
+_RE_AD = re.compile('|'.join(map(re.escape, _AD_KEYWORDS)))
+_RE_AD_TIME = re.compile(r'.{0,3}\d{1,2}:\d{2}')
+_RE_AD_DISTANCE = re.compile(r'^\d+\.?\d*\s?(公里|km|米|m|分钟)$')
+_RE_ADDRESS_ADMIN = re.compile('[区县市省镇乡村]')
+_RE_ADDRESS_ROAD = re.compile('[路街道巷弄里棚号栋楼层室幢]')
+_RE_ADDRESS_DISTANCE = re.compile('|'.join(map(re.escape, _DISTANCE_KEYWORDS)))
+_RE_ADDRESS_SPECIAL = re.compile('|'.join(map(re.escape, _SPECIAL_ADDRESS_KEYWORDS)))
+_RE_ADDRESS_NUMBER = re.compile(r'[A-Z]\d+-\d+号|\d+期\d+-\d+')
+
+# 逐节点调用的正则（HTML清理、评分/时间/照片标签判断）
+_RE_FONT = re.compile(r'<font[^>]*size="(\d+)"[^>]*>([^<]+)</font>')
+_RE_CLEAN_NAME = re.compile(r'[（）()·.。\s]')
+_RE_SCORE = re.compile(r'^\d+\.\d+$')
+_RE_SCORE_FEN = re.compile(r'^\d+\.\d+\s*分')
+_RE_TIME = re.compile(r'^\d{2}:\d{2}')
+_RE_PHOTO = re.compile(r'^照片\(\d+\)$')
+_RE_RECORD_TAG = re.compile(r'^收录\d+[年个月天]')
+
+# 电话号码提取
+_RE_MOBILE = re.compile(r'1[3-9]\d{9}')  # 11位手机号
+_RE_LANDLINE = re.compile(r'0\d{2,3}-?\d{7,8}')  # 固定电话（区号-号码）
+_RE_OTHER_PHONE = re.compile(r'\d{3,4}-\d{7,8}')  # 其他格式
+# 正则兜底时依次匹配：手机号、固定电话、其他格式（各自独立匹配，互不抢占数字）
+_FALLBACK_PHONE_PATTERNS = (_RE_MOBILE, _RE_LANDLINE, _RE_OTHER_PHONE)
+_RE_NON_DIGIT = re.compile(r'\D')
+_RE_DIGIT = re.compile(r'\d')
+_MIN_PHONE_LENGTH = 10
+
+# 非空text且带bounds的节点的text属性值（直接投影属性值，避免逐节点get）
+_XP_TEXT_NODE_TEXTS = etree.XPath('//node[@text and string-length(@text) > 0 and @bounds]/@text')
+
+# 卡片内去掉首尾空白后长度>2的text属性值（相对路径，长度过滤在libxml2中完成）
+_XP_CARD_TEXTS = etree.XPath('.//node[string-length(normalize-space(@text)) > 2]/@text')
+
+# 页面检测和信息提取用到的XPath（导入时编译一次，避免每帧重新解析表达式）
+_XP_HAS_FILTER = etree.XPath('boolean(//node[contains(@text, "筛选")])')
+_XP_HAS_SORT = etree.XPath('boolean(//node[contains(@text, "排序")])')
+_XP_HAS_RECYCLERVIEW = etree.XPath('boolean(//node[@class="androidx.recyclerview.widget.RecyclerView"])')
+_XP_HAS_DIALER_DIGITS = etree.XPath(
+    'boolean(//node[@clickable="true" and (@text="1" or @content-desc="1" or @text="2" or @content-desc="2")])'
+)
+_XP_TEXT_BOUNDS_NODES = etree.XPath('//node[@text and @bounds]')
+_XP_DESCENDANT_LABEL_NODES = etree.XPath('.//node[@text or @content-desc]')
+_XP_CLICKABLE_PHONE_NODES = etree.XPath(
+    '//node[@clickable="true" and (contains(@text, "电话") or contains(@content-desc, "电话")) and @bounds]'
+)
+_XP_PHONE_NODES = etree.XPath('//node[contains(@text, "电话") or contains(@content-desc, "电话")]')
+_XP_TEXT_LONG = etree.XPath('//node[@text and string-length(@text) > 10 and @bounds]')
+
+
+def _is_excluded_text(text: str) -> bool:
+    """
+    判断是否是需要排除的文本（如按钮文本、提示文本等）
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        是否需要排除
+    """
+    return _RE_EXCLUDED.search(text) is not None
+
+
+def _is_advertisement(text: str) -> bool:
+    """
+    识别并排除广告内容
+
+    Args:
+        text: 文本内容
+
+    Returns:
+        是否为广告
+    """
+    # 广告关键词（增强版 - 2025-01-17更新，见 _AD_KEYWORDS）
+    if _RE_AD.search(text):
+        return True
+
+    # 排除时间格式（如 "半夜12:12"）
+    if _RE_AD_TIME.match(text):
+        return True
+
+    # 排除纯数字加单位（如 "5.8公里"）
+    if _RE_AD_DISTANCE.match(text):
+        return True
+
+    return False
+
+
+def _is_address_text(text: str) -> bool:
+    """
+    判断是否是地址信息（2025-01-16新增）
+    与merchant_card_locator.py保持一致
+    """
+    # 计数命中的关键词类型（行政区划 / 道路建筑 / 距离和时间）
+    has_admin = _RE_ADDRESS_ADMIN.search(text) is not None
+    has_road = _RE_ADDRESS_ROAD.search(text) is not None
+    has_distance = _RE_ADDRESS_DISTANCE.search(text) is not None
+
+    # 1. 同时包含行政区划 + 道路建筑 → 地址
+    if has_admin and has_road:
+        return True
+    # 2. 包含距离/时间描述 → 地址或距离信息
+    if has_distance:
+        return True
+    # 3. 包含特殊地址词
+    if _RE_ADDRESS_SPECIAL.search(text):
+        if len(text) < 15:
+            keyword_count = sum(1 for k in _SPECIAL_ADDRESS_KEYWORDS if k in text)
+            if keyword_count == 1 and ('市场' in text or '交易中心' in text):
+                return False  # 可能是商家名
+        return True
+    # 4. 地址编号模式
+    if _RE_ADDRESS_NUMBER.search(text):
+        return True
+
+    return False
+
+
+def _iter_card_geometry(nodes, screen_width: int):
+    """
+    按bounds几何条件批量筛选商家卡片节点（先做廉价的坐标过滤，再解析名称）
+
+    Args:
+        nodes: 候选节点列表
+        screen_width: 屏幕宽度
+
+    Returns:
+        生成 (node, (x1, y1, x2, y2))，仅包含位置和尺寸符合商家卡片的节点
+    """
+    # 宽度必须接近全屏（>85%）
+    min_width = screen_width * 0.85
+
+    for node in nodes:
+        coords = _split_bounds(node.get('bounds', ''))
+        if coords is None:
+            continue
+
+        x1, y1, x2, y2 = coords
+
+        # 严格的Y轴区域过滤（商家列表在屏幕中部）
+        # 昆明：真商家从 Y=612 开始，广告在 Y=255-561
+        # 成都：真商家从 Y=533 开始
+        # 2025-01-16更新：从450提升至500，更严格过滤顶部广告
+        if y1 < 500 or y2 > 1000:
+            continue
+
+        # 严格的尺寸过滤
+        if x2 - x1 < min_width:
+            continue
+
+        # 高度在120-250像素之间
+        height = y2 - y1
+        if height < 120 or height > 250:
+            continue
+
+        yield node, coords
+
+
+def _scan_keywords(nodes, keywords) -> tuple:
+    """
+    单次遍历节点，收集text和content-desc中出现的关键词
+
+    Args:
+        nodes: 节点迭代器（如 root.iter('node')）
+        keywords: 关键词元组
+
+    Returns:
+        (text命中集合, content-desc命中集合)
+    """
+    text_hits = set()
+    desc_hits = set()
+
+    for node in nodes:
+        text = node.get('text')
+        content_desc = node.get('content-desc')
+        for keyword in keywords:
+            if text and keyword in text:
+                text_hits.add(keyword)
+            if content_desc and keyword in content_desc:
+                desc_hits.add(keyword)
+
+    return text_hits, desc_hits
+
+
+def _find_first_keyword(nodes, keywords, check_desc: bool = True) -> Optional[str]:
+    """
+    单次遍历节点，返回第一个命中的关键词（命中即停止遍历）
+
+    Args:
+        nodes: 节点迭代器（如 root.iter('node')）
+        keywords: 关键词元组
+        check_desc: 是否同时检查content-desc
+
+    Returns:
+        命中的关键词，未命中返回None
+    """
+    for node in nodes:
+        text = node.get('text') or ''
+        content_desc = (node.get('content-desc') or '') if check_desc else ''
+        for keyword in keywords:
+            if keyword in text or keyword in content_desc:
+                return keyword
+
+    return None
+
+
 class MerchantCollector:
     """商家信息采集类"""
 
@@ -36,20 +291,25 @@ class MerchantCollector:
         self.collected_merchants = []
         self.last_page_content = None
 
+        # 当前界面的UI层级缓存 (拉取时间, XML文本, 解析树)，点击/返回/滑动后或超过有效期失效
+        self._ui_cache = (0.0, None, None)
+        # 最近一次解析的 (XML文本, 解析树)，不随缓存失效清除：界面没变时重新拉取到相同XML直接复用解析树
+        self._last_parsed = (None, None)
+
         # 加载配置
         self.config = self._load_config(config_path)
 
-        # 获取屏幕尺寸
-        screen_width, screen_height = self.adb_manager.get_screen_size()
-
-        # 初始化精确定位器
-        self.card_locator = MerchantCardLocator(screen_width, screen_height, config_path)
-        self.detail_locator = MerchantDetailLocator(screen_width, screen_height)
+        # 获取屏幕尺寸（采集期间不变，只查询一次）
+        self.screen_width, self.screen_height = self.adb_manager.get_screen_size()
 
         # 调试模式设置
         self.debug_mode = self.config.get('debug_mode', {}).get('enabled', False)
         self.screenshot_dir = self.config.get('debug_mode', {}).get('screenshot_dir', './debug_screenshots')
 
+        # 初始化精确定位器
+        self.card_locator = MerchantCardLocator(self.screen_width, self.screen_height, config_path)
+        self.detail_locator = MerchantDetailLocator(self.screen_width, self.screen_height, self.debug_mode)
+
         # 创建截图目录
         if self.debug_mode and self.config.get('debug_mode', {}).get('save_card_screenshots', False):
             os.makedirs(self.screenshot_dir, exist_ok=True)
@@ -75,6 +335,129 @@ class MerchantCollector:
             print(f"⚠ 加载配置文件失败: {e}，使用默认配置")
             return {}
 
+    def _get_root(self, force: bool = False):
+        """
+        获取当前界面的XML解析树（有效期内同一界面只拉取和解析一次）
+
+        Args:
+            force: 是否强制重新拉取UI层级
+
+        Returns:
+            XML根节点，获取失败返回None
+        """
+        cached_at, xml_content, root = self._ui_cache
+        if not force and xml_content and time.monotonic() - cached_at < _UI_CACHE_TTL:
+            if root is None:
+                # 只拉取过XML文本（见_get_ui_xml），首次需要时再解析
+                root = self._parse_ui_xml(xml_content)
+                self._ui_cache = (cached_at, xml_content, root)
+            return root
+
+        self._invalidate_ui_cache()
+        return self._cache_ui_hierarchy(self.adb_manager.get_ui_hierarchy())
+
+    def _get_ui_xml(self, force: bool = False):
+        """
+        获取当前界面的UI层级XML文本，只拉取不解析（解析树在_get_root首次需要时才构建）
+
+        Args:
+            force: 是否强制重新拉取UI层级
+
+        Returns:
+            UI层级XML，获取失败返回None
+        """
+        cached_at, xml_content, _ = self._ui_cache
+        if not force and xml_content and time.monotonic() - cached_at < _UI_CACHE_TTL:
+            return xml_content
+
+        self._invalidate_ui_cache()
+        xml_content = self.adb_manager.get_ui_hierarchy()
+        if xml_content:
+            self._ui_cache = (time.monotonic(), xml_content, None)
+
+        return xml_content
+
+    def _cache_ui_hierarchy(self, xml_content):
+        """
+        解析拉取到的UI层级并写入缓存
+
+        Args:
+            xml_content: UI层级XML（str或bytes）
+
+        Returns:
+            XML根节点，内容为空返回None
+        """
+        if not xml_content:
+            return None
+
+        root = self._parse_ui_xml(xml_content)
+        self._ui_cache = (time.monotonic(), xml_content, root)
+
+        return root
+
+    def _parse_ui_xml(self, xml_content):
+        """
+        解析UI层级XML（与上一次解析的XML相同时直接返回上次的解析树）
+
+        等待界面稳定、点击后验证等流程会对同一界面反复拉取，
+        拉取到的XML没变就不必再解析一遍（解析树只读，复用是安全的）
+
+        Args:
+            xml_content: UI层级XML（str或bytes）
+
+        Returns:
+            XML根节点
+        """
+        last_xml, last_root = self._last_parsed
+        if last_root is not None and xml_content == last_xml:
+            return last_root
+
+        # 带encoding声明的XML不能以str直接解析；已是bytes时无需再编码
+        xml_bytes = xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content
+        root = etree.fromstring(xml_bytes, _get_xml_parser())
+        self._last_parsed = (xml_content, root)
+        return root
+
+    def _wait_for_ui_stable(self, timeout: float = 2.0, min_wait: float = _UI_SETTLE_MIN_WAIT,
+                            previous_xml: Optional[str] = None):
+        """
+        等待界面加载完成：连续两次拉取的UI层级完全相同即认为界面已稳定，
+        代替点击后固定时长的sleep（多数页面0.5秒左右就已稳定）
+
+        Args:
+            timeout: 最长等待时间（秒），超时后使用最后一次拉取的结果
+            min_wait: 开始比较前的最短等待时间（秒），调用方已等过切换动画时可传0
+            previous_xml: 点击前界面的UI层级。新界面还没出现时旧界面同样是静止的，
+                          与它相同的UI层级不算稳定，一直等到界面变化或超时
+
+        Returns:
+            稳定后界面的XML根节点，获取失败返回None
+        """
+        self._invalidate_ui_cache()
+        # 刚点击完时界面可能还没开始切换，先等一小段再比较，避免把旧页面误判为稳定
+        if min_wait > 0:
+            time.sleep(min_wait)
+        deadline = time.monotonic() + timeout - min_wait
+
+        last_xml = None
+        while True:
+            xml_content = self.adb_manager.get_ui_hierarchy()
+            if xml_content and xml_content == last_xml and xml_content != previous_xml:
+                break
+            if xml_content:
+                last_xml = xml_content
+            if time.monotonic() >= deadline:
+                if self.debug_mode:
+                    print(f"  等待界面稳定超时（{timeout}秒），使用最后一次UI层级")
+                break
+            time.sleep(_UI_SETTLE_POLL)
+
+        return self._cache_ui_hierarchy(last_xml)
+
+    def _invalidate_ui_cache(self):
+        """界面可能已变化（点击、返回、滑动后），清除UI层级缓存"""
+        self._ui_cache = (0.0, None, None)
+
     def parse_merchant_list(self) -> List[Dict]:
         """
         解析当前页面的商家列表（使用精确定位器）
@@ -96,9 +479,9 @@ class MerchantCollector:
         merchants = []
 
         try:
-            # 获取UI层级
-            xml_content = self.adb_manager.get_ui_hierarchy()
-            if not xml_content:
+            # 获取UI层级（重新拉取并写入缓存，随后的页面检测和列表末尾判断共用这一棵解析树）
+            root = self._get_root(force=True)
+            if root is None:
                 print("✗ 无法获取UI层级")
                 return merchants
 
@@ -108,14 +491,15 @@ class MerchantCollector:
                 print("🔍 开始解析商家卡片列表")
                 print("="*80)
 
-            cards = self.card_locator.find_merchant_cards(xml_content, debug_mode=self.debug_mode)
+            cards = self.card_locator.find_merchant_cards_root(root, debug_mode=self.debug_mode)
 
             # 转换为旧格式以兼容现有代码
             for card in cards:
+                click_point = card['click_point']
                 merchant = {
                     'name': card['name'],
-                    'click_x': card['click_point']['x'],
-                    'click_y': card['click_point']['y'],
+                    'click_x': click_point['x'],
+                    'click_y': click_point['y'],
                     'bounds': card['bounds'],
                     'confidence': card['confidence'],
                     'index': card.get('index', 0)
@@ -135,7 +519,6 @@ class MerchantCollector:
 
         except Exception as e:
             print(f"✗ 解析商家列表失败: {e}")
-            import traceback
             traceback.print_exc()
 
         return merchants
@@ -152,8 +535,10 @@ class MerchantCollector:
             timestamp = time.strftime('%Y%m%d_%H%M%S')
             screenshot_path = os.path.join(self.screenshot_dir, f"merchant_list_{timestamp}.png")
 
-            # 使用ADB截图
-            self.adb_manager.device.screenshot(screenshot_path)
+            # 使用ADB截图（直接读取screencap输出，不经设备存储中转）
+            if not self.adb_manager.screenshot_pipe(screenshot_path):
+                print("  ⚠ 保存截图失败")
+                return
             print(f"  📸 截图已保存: {screenshot_path}")
             print(f"  📋 识别到 {len(merchants)} 个商家卡片")
 
@@ -169,36 +554,45 @@ class MerchantCollector:
             current_idx: 当前索引（1-based）
             total: 总数量
         """
-        print(f"\n  {'='*60}")
-        print(f"  📍 点击前验证 [{current_idx}/{total}]")
-        print(f"  {'='*60}")
-        print(f"  商家名称: {merchant['name']}")
-        print(f"  点击坐标: ({merchant['click_x']}, {merchant['click_y']})")
-        print(f"  卡片边界: [{merchant['bounds']['x1']},{merchant['bounds']['y1']}]"
-              f"[{merchant['bounds']['x2']},{merchant['bounds']['y2']}]")
-        print(f"  卡片尺寸: {merchant['bounds']['width']}x{merchant['bounds']['height']} 像素")
+        bounds = merchant['bounds']
+        lines = [
+            f"\n  {'='*60}",
+            f"  📍 点击前验证 [{current_idx}/{total}]",
+            f"  {'='*60}",
+            f"  商家名称: {merchant['name']}",
+            f"  点击坐标: ({merchant['click_x']}, {merchant['click_y']})",
+            f"  卡片边界: [{bounds['x1']},{bounds['y1']}][{bounds['x2']},{bounds['y2']}]",
+            f"  卡片尺寸: {bounds['width']}x{bounds['height']} 像素",
+        ]
 
         if 'confidence' in merchant:
             confidence = merchant['confidence']
             confidence_level = "高" if confidence >= 0.9 else ("中" if confidence >= 0.7 else "低")
-            print(f"  置信度: {confidence:.2%} ({confidence_level})")
+            lines.append(f"  置信度: {confidence:.2%} ({confidence_level})")
+
+        lines.append(f"  {'='*60}")
 
-        print(f"  {'='*60}")
+        # 合并为一次输出
+        print("\n".join(lines))
 
-    def _verify_post_click(self) -> bool:
+    def _verify_post_click(self, root=None) -> tuple:
         """
         验证点击后是否进入正确页面
 
+        Args:
+            root: 点击后稳定界面的XML根节点，为None时使用当前界面缓存
+
         Returns:
-            是否成功进入商家详情页
+            (是否成功进入商家详情页, 详情页中命中的"补充电话"类关键词或None)
         """
         print(f"\n  🔍 点击后验证...")
 
         try:
             # 检查是否进入商家详情页
-            if self._is_on_merchant_detail_page():
+            is_detail_page, supplement_keyword = self._check_merchant_detail_page(root)
+            if is_detail_page:
                 print(f"  ✓ 验证通过：成功进入商家详情页")
-                return True
+                return True, supplement_keyword
             else:
                 print(f"  ✗ 验证失败：未进入商家详情页")
 
@@ -207,16 +601,16 @@ class MerchantCollector:
                     timestamp = time.strftime('%Y%m%d_%H%M%S')
                     screenshot_path = os.path.join(self.screenshot_dir, f"click_failed_{timestamp}.png")
                     try:
-                        self.adb_manager.device.screenshot(screenshot_path)
-                        print(f"    📸 错误页面截图已保存: {screenshot_path}")
+                        if self.adb_manager.screenshot_pipe(screenshot_path):
+                            print(f"    📸 错误页面截图已保存: {screenshot_path}")
                     except:
                         pass
 
-                return False
+                return False, None
 
         except Exception as e:
             print(f"  ✗ 验证过程出错: {e}")
-            return False
+            return False, None
 
     def _extract_from_recyclerview(self, root, screen_width: int, screen_height: int) -> List[Dict]:
         """
@@ -224,21 +618,14 @@ class MerchantCollector:
 
         识别模式：
         //node[@class="androidx.recyclerview.widget.RecyclerView"]
-          /node[@class="android.view.ViewGroup" and @clickable="true"]
+          //node[@class="android.view.ViewGroup" and @clickable="true"]
         """
         merchants = []
 
-        # 查找RecyclerView
-        recyclerviews = root.xpath('//node[@class="androidx.recyclerview.widget.RecyclerView"]')
-
-        for recyclerview in recyclerviews:
-            # 查找其下的ViewGroup节点
-            viewgroups = recyclerview.xpath('.//node[@class="android.view.ViewGroup" and @clickable="true" and @bounds]')
-
-            for viewgroup in viewgroups:
-                merchant_info = self._parse_merchant_card(viewgroup, screen_width, screen_height)
-                if merchant_info:
-                    merchants.append(merchant_info)
+        for viewgroup, coords in _iter_card_geometry(_XP_RV_CARDS(root), screen_width):
+            merchant_info = self._parse_merchant_card(viewgroup, coords)
+            if merchant_info:
+                merchants.append(merchant_info)
 
         return merchants
 
@@ -249,48 +636,25 @@ class MerchantCollector:
         merchants = []
 
         # 查找所有带content-desc且可点击的节点
-        nodes = root.xpath('//node[@content-desc and @clickable="true" and @bounds]')
-
-        for node in nodes:
-            merchant_info = self._parse_merchant_card(node, screen_width, screen_height)
+        for node, coords in _iter_card_geometry(_XP_DESC_CARDS(root), screen_width):
+            merchant_info = self._parse_merchant_card(node, coords)
             if merchant_info:
                 merchants.append(merchant_info)
 
         return merchants
 
-    def _parse_merchant_card(self, node, screen_width: int, screen_height: int) -> Optional[Dict]:
+    def _parse_merchant_card(self, node, coords: tuple) -> Optional[Dict]:
         """
-        解析单个商家卡片节点
-        """
-        # 获取bounds
-        bounds = node.get('bounds', '')
-        if not bounds:
-            return None
-
-        match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds)
-        if not match:
-            return None
-
-        x1, y1, x2, y2 = map(int, match.groups())
-
-        # 严格的Y轴区域过滤（商家列表在屏幕中部）
-        # 昆明：真商家从 Y=612 开始，广告在 Y=255-561
-        # 成都：真商家从 Y=533 开始
-        # 2025-01-16更新：从450提升至500，更严格过滤顶部广告
-        if y1 < 500 or y2 > 1000:
-            return None
+        解析单个商家卡片节点（坐标已通过 _iter_card_geometry 几何过滤）
 
-        # 严格的尺寸过滤
-        width = x2 - x1
-        height = y2 - y1
-
-        # 宽度必须接近全屏（>85%）
-        if width < screen_width * 0.85:
-            return None
+        Args:
+            node: 卡片节点
+            coords: 卡片bounds (x1, y1, x2, y2)
 
-        # 高度在120-250像素之间
-        if height < 120 or height > 250:
-            return None
+        Returns:
+            商家信息字典，非商家卡片返回None
+        """
+        x1, y1, x2, y2 = coords
 
         # 提取商家名称
         merchant_name = self._extract_merchant_name(node)
@@ -298,7 +662,7 @@ class MerchantCollector:
             return None
 
         # 排除广告和系统元素
-        if self._is_advertisement(merchant_name):
+        if _is_advertisement(merchant_name):
             print(f"  ⚠ 跳过广告: {merchant_name}")
             return None
 
@@ -321,141 +685,35 @@ class MerchantCollector:
         # 优先使用content-desc
         content_desc = node.get('content-desc', '').strip()
         if content_desc and len(content_desc) > 2:
-            if not self._is_excluded_text(content_desc) and not self._is_address_text(content_desc):
+            if not _is_excluded_text(content_desc) and not _is_address_text(content_desc):
                 return content_desc
 
         # 备用：查找text节点
-        text_nodes = node.xpath('.//node[@text and string-length(@text) > 0]')
-        for text_node in text_nodes:
-            text = text_node.get('text', '').strip()
-            if text and len(text) > 2:
-                # 排除系统文本、地址和距离
-                if self._is_excluded_text(text) or self._is_address_text(text):
-                    continue
-                # 排除纯数字和距离文本
-                if text.replace('.', '').replace('km', '').replace('m', '').isdigit():
-                    continue
-                return text
+        for text in _XP_CARD_TEXTS(node):
+            text = text.strip()
+            # normalize-space不处理全角空格等Unicode空白，保留长度判断
+            if len(text) <= 2:
+                continue
+            # 排除系统文本、地址和距离
+            if _is_excluded_text(text) or _is_address_text(text):
+                continue
+            # 排除纯数字和距离文本
+            if text.replace('.', '').replace('km', '').replace('m', '').isdigit():
+                continue
+            return text
 
         return "未知商家"
 
-    def _is_address_text(self, text: str) -> bool:
-        """
-        判断是否是地址信息（2025-01-16新增）
-        与merchant_card_locator.py保持一致
-        """
-        # 地址关键词（行政区划）
-        address_keywords_admin = ['区', '县', '市', '省', '镇', '乡', '村']
-        # 地址关键词（道路建筑）
-        address_keywords_road = ['路', '街', '道', '巷', '弄', '里', '大棚', '棚', '号', '栋', '楼', '层', '室', '幢']
-        # 距离和时间关键词
-        distance_keywords = ['公里', 'km', '米', 'm', '驾车', '步行', '分钟', '小时']
-
-        # 计数命中的关键词类型
-        has_admin = any(keyword in text for keyword in address_keywords_admin)
-        has_road = any(keyword in text for keyword in address_keywords_road)
-        has_distance = any(keyword in text for keyword in distance_keywords)
-
-        # 1. 同时包含行政区划 + 道路建筑 → 地址
-        if has_admin and has_road:
-            return True
-        # 2. 包含距离/时间描述 → 地址或距离信息
-        if has_distance:
-            return True
-        # 3. 包含特殊地址词
-        if any(keyword in text for keyword in ['大棚', '草莓地', '市场', '交易中心']):
-            if len(text) < 15:
-                keyword_count = sum(1 for k in ['大棚', '草莓地', '市场', '交易中心'] if k in text)
-                if keyword_count == 1 and ('市场' in text or '交易中心' in text):
-                    return False  # 可能是商家名
-            return True
-        # 4. 地址编号模式
-        if re.search(r'[A-Z]\d+-\d+号', text) or re.search(r'\d+期\d+-\d+', text):
-            return True
-
-        return False
-
     def _merge_merchant_lists(self, list1: List[Dict], list2: List[Dict]) -> List[Dict]:
         """
         合并两个商家列表，去除重复项
         """
-        merged = []
-        seen_positions = set()
-
-        # 优先添加list1（RecyclerView结果）
-        for merchant in list1:
-            pos_key = (merchant['bounds']['x1'], merchant['bounds']['y1'])
-            if pos_key not in seen_positions:
-                merged.append(merchant)
-                seen_positions.add(pos_key)
-
-        # 补充list2中的新商家
-        for merchant in list2:
-            pos_key = (merchant['bounds']['x1'], merchant['bounds']['y1'])
-            if pos_key not in seen_positions:
-                merged.append(merchant)
-                seen_positions.add(pos_key)
-
-        return merged
-
-    def _is_excluded_text(self, text: str) -> bool:
-        """
-        判断是否是需要排除的文本（如按钮文本、提示文本等）
-
-        Args:
-            text: 文本内容
-
-        Returns:
-            是否需要排除
-        """
-        excluded_keywords = [
-            '搜索', '导航', '路线', '附近', '更多', '分享', '收藏',
-            '大家还在搜', '根据当前位置推荐', '附近更多', '查看',
-            '去过', '想去', '人均', '公里', 'km', 'm'
-        ]
-
-        for keyword in excluded_keywords:
-            if keyword in text:
-                return True
-
-        return False
-
-    def _is_advertisement(self, text: str) -> bool:
-        """
-        识别并排除广告内容
-
-        Args:
-            text: 文本内容
+        # 以左上角坐标为键，list1（RecyclerView结果）优先，list2只补充新位置
+        merged = {}
+        for merchant in list1 + list2:
+            merged.setdefault((merchant['bounds']['x1'], merchant['bounds']['y1']), merchant)
 
-        Returns:
-            是否为广告
-        """
-        # 广告关键词（增强版 - 2025-01-17更新）
-        ad_keywords = [
-            '高德红包', '优惠', '券', '领取', '满减', '折扣', '减',
-            '刚刚浏览', '最近浏览', '大家还在搜', '推荐', '榜单', '服务推荐',
-            '扫街榜', '爆款', '精选', '新客', '满', '已领取',
-            '鲜花上门配送', '上门配送', '配送服务', '买花榜',
-            '鲜花配送', '送货上门', '配送推荐', '服务', '推荐商家',
-            # 强化过滤：组合词
-            '场地布置', '气球派对', '开业花篮', '绿植',
-            '（昆明店）', '（成都店）', '（西安店）',  # 连锁广告特征
-            '馨爱鲜花'  # 明确的广告商家
-        ]
-
-        for keyword in ad_keywords:
-            if keyword in text:
-                return True
-
-        # 排除时间格式（如 "半夜12:12"）
-        if re.match(r'.{0,3}\d{1,2}:\d{2}', text):
-            return True
-
-        # 排除纯数字加单位（如 "5.8公里"）
-        if re.match(r'^\d+\.?\d*\s?(公里|km|米|m|分钟)$', text):
-            return True
-
-        return False
+        return list(merged.values())
 
     def _find_merchant_name_by_similarity(self, root, expected_name: str, screen_height: int) -> str:
         """
@@ -476,45 +734,41 @@ class MerchantCollector:
             return self._extract_merchant_name_from_detail(root, screen_height)
 
         # 清理期望名称
-        expected_clean = re.sub(r'[（）()·.。\s]', '', expected_name)
-
-        all_text_nodes = root.xpath('//node[@text and string-length(@text) > 0 and @bounds]')
+        expected_clean = _RE_CLEAN_NAME.sub('', expected_name)
+        # 字符集合只构建一次（空名称时下面的包含判断恒成立，不会用到）
+        expected_chars = set(expected_clean)
+        expected_len = len(expected_clean)
 
         best_match = None
         best_score = 0
 
-        for node in all_text_nodes:
-            text = node.get('text', '').strip()
-            clean_text = re.sub(r'<[^>]+>', '', text).strip()
+        for text in _XP_TEXT_NODE_TEXTS(root):
+            clean_text = _strip_html(text).strip()
 
             if len(clean_text) < 3 or len(clean_text) > 50:
                 continue
 
             # 🆕 关键过滤：排除明显不是商家名的文本
             # 排除纯数字评分（如"4.1"、"3.8"）
-            if re.match(r'^\d+\.\d+$', clean_text):
+            if _RE_SCORE.match(clean_text):
                 continue
             # 排除时间
-            if re.match(r'^\d{2}:\d{2}', clean_text):
+            if _RE_TIME.match(clean_text):
                 continue
             # 排除照片标签
-            if re.match(r'^照片\(\d+\)$', clean_text):
+            if _RE_PHOTO.match(clean_text):
                 continue
 
             # 清理后再比较
-            clean_text_compare = re.sub(r'[（）()·.。\s]', '', clean_text)
+            clean_text_compare = _RE_CLEAN_NAME.sub('', clean_text)
 
             # 计算相似度
             if expected_clean in clean_text_compare or clean_text_compare in expected_clean:
                 # 包含关系，高分
                 score = 1.0
             else:
-                # 字符重合度
-                common = set(expected_clean) & set(clean_text_compare)
-                if len(expected_clean) > 0:
-                    score = len(common) / len(expected_clean)
-                else:
-                    score = 0
+                # 字符重合度（与字符串直接求交集，无需再构建集合）
+                score = len(expected_chars.intersection(clean_text_compare)) / expected_len
 
             if score > best_score and score >= 0.5:
                 best_score = score
@@ -544,20 +798,19 @@ class MerchantCollector:
         Returns:
             商家名称（如未找到返回"未知商家"）
         """
-        all_text_nodes = root.xpath('//node[@text and string-length(@text) > 0 and @bounds]')
-
         candidates = []
 
-        for node in all_text_nodes:
-            text = node.get('text', '').strip()
-            bounds_str = node.get('bounds', '')
+        for node in root.iter('node'):
+            text = node.get('text')
+            if not text:
+                continue
 
-            # 解析bounds
-            match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds_str)
-            if not match:
+            # 解析bounds（文本的首尾空白在下面清理HTML时一并去除，Y轴范围外的节点不做文本处理）
+            coords = _split_bounds(node.get('bounds'))
+            if coords is None:
                 continue
 
-            x1, y1, x2, y2 = map(int, match.groups())
+            x1, y1, x2, y2 = coords
 
             # 🆕 关键1：Y轴必须在200-1200（扩大范围，包含照片下方的商家名）
             # 商家名通常在照片下方，Y轴可能在600-1000之间
@@ -568,14 +821,14 @@ class MerchantCollector:
             font_size = 0
             clean_text = text
 
-            # 尝试提取HTML font标签
-            font_match = re.search(r'<font[^>]*size="(\d+)"[^>]*>([^<]+)</font>', text)
+            # 尝试提取HTML font标签（不含<font的文本不跑正则）
+            font_match = _RE_FONT.search(text) if '<font' in text else None
             if font_match:
                 font_size = int(font_match.group(1))
                 clean_text = font_match.group(2).strip()
             else:
                 # 没有HTML标签，直接清理
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
+                clean_text = _strip_html(text).strip()
 
             # 🆕 关键2：长度必须在3-30字符（商家名特征）
             if not (3 <= len(clean_text) <= 30):
@@ -586,19 +839,19 @@ class MerchantCollector:
                 continue
 
             # 🆕 关键4：排除非商家名文本
-            if self._is_excluded_text(clean_text):
+            if _is_excluded_text(clean_text):
                 continue
-            if self._is_address_text(clean_text):
+            if _is_address_text(clean_text):
                 continue
 
             # 🆕 关键：排除评分数字（如"3.8"、"4.1"）
-            if re.match(r'^\d+\.\d+$', clean_text):
+            if _RE_SCORE.match(clean_text):
                 continue  # 纯数字评分
-            if re.match(r'^\d+\.\d+\s*分', clean_text):
+            if _RE_SCORE_FEN.match(clean_text):
                 continue  # 带"分"的评分
 
             # 排除时间（如"09:00"）
-            if re.match(r'^\d{2}:\d{2}', clean_text):
+            if _RE_TIME.match(clean_text):
                 continue
 
             # 排除营业状态
@@ -610,7 +863,7 @@ class MerchantCollector:
                 continue
 
             # 🆕 排除照片标签（如"照片(1)"、"照片(2)"）
-            if re.match(r'^照片\(\d+\)$', clean_text):
+            if _RE_PHOTO.match(clean_text):
                 continue
             if clean_text.startswith('照片') or '相册' in clean_text:
                 continue
@@ -631,25 +884,38 @@ class MerchantCollector:
         # 1. 字体大小最重要（商家名字体最大）
         # 2. 长度优先（商家名4-20字符）
         # 3. Y轴位置（越靠上越好）
-        candidates.sort(key=lambda x: (
+        # 只需要前3名，用nsmallest取代全量排序（结果与sorted(...)[:3]一致）
+        top_candidates = heapq.nsmallest(3, candidates, key=lambda x: (
             -x['font_size'],                # 字体越大越优先（商家名字体最大）
             abs(x['length'] - 12),          # 长度接近12最好
             x['y_pos']                      # Y轴位置最后考虑
         ))
 
-        best_name = candidates[0]['text']
+        best_name = top_candidates[0]['text']
 
         # 调试信息：显示前3个候选
         if len(candidates) > 1:
             print(f"  候选商家名Top3:")
-            for i, cand in enumerate(candidates[:3]):
+            for i, cand in enumerate(top_candidates):
                 print(f"    [{i+1}] {cand['text']} (字体={cand['font_size']}, Y={cand['y_pos']}, 长度={cand['length']})")
 
-        print(f"✓ 从详情页提取商家名: {best_name} (Y={candidates[0]['y_pos']}, 字体={candidates[0]['font_size']})")
+        print(f"✓ 从详情页提取商家名: {best_name} (Y={top_candidates[0]['y_pos']}, 字体={top_candidates[0]['font_size']})")
 
         return best_name
 
-    def _is_on_merchant_detail_page(self) -> bool:
+    def _is_on_merchant_detail_page(self, root=None) -> bool:
+        """
+        检测是否在商家详情页（见 _check_merchant_detail_page）
+
+        Args:
+            root: 已解析的XML根节点，为None时使用当前界面缓存
+
+        Returns:
+            是否在商家详情页
+        """
+        return self._check_merchant_detail_page(root)[0]
+
+    def _check_merchant_detail_page(self, root=None) -> tuple:
         """
         检测是否在商家详情页（2025-01-16增强：新增右上角3按钮检测）
 
@@ -671,100 +937,122 @@ class MerchantCollector:
         │ [电话] [导航] [收藏]            │ ← 操作按钮
         └─────────────────────────────────┘
 
+        同一遍历中顺带查找"补充电话"类关键词，调用方可直接传给collect_merchant_detail，省去一次遍历
+
+        Args:
+            root: 已解析的XML根节点，为None时使用当前界面缓存
+
         Returns:
-            是否在商家详情页
+            (是否在商家详情页, 命中的"补充电话"类关键词或None)
         """
         try:
-            xml_content = self.adb_manager.get_ui_hierarchy()
-            if not xml_content:
-                return False
+            if root is None:
+                root = self._get_root()
+            if root is None:
+                return False, None
+
+            # 第1步：一次遍历收集关键词（出现广告特征即停止，此时必然不是详情页，补充电话关键词用不到）
+            text_hits = set()
+            desc_hits = set()
+            supplement_keyword = None
+            for node in root.iter('node'):
+                text = node.get('text')
+                content_desc = node.get('content-desc')
+                for keyword in _DETAIL_PAGE_KEYWORDS:
+                    if text and keyword in text:
+                        text_hits.add(keyword)
+                    if content_desc and keyword in content_desc:
+                        desc_hits.add(keyword)
+                if supplement_keyword is None:
+                    for supplement in _SUPPLEMENT_KEYWORDS:
+                        if (text and supplement in text) or (content_desc and supplement in content_desc):
+                            supplement_keyword = supplement
+                            break
+                if not text_hits.isdisjoint(_DETAIL_AD_KEYWORDS):
+                    break
+
+            all_hits = text_hits | desc_hits
+
+            # 原有特征2：必须有电话按钮（有电话的才是有效商家）
+            has_phone = '电话' in all_hits
+            # 原有特征3：导航按钮
+            has_nav = '导航' in all_hits or '路线' in all_hits
+            # 排除搜索结果页特征（仅检查text）
+            has_filter = '筛选' in text_hits
+            has_sort = '排序' in text_hits
+            # 排除广告页面特征（仅检查text）
+            is_ad_page = not text_hits.isdisjoint(_DETAIL_AD_KEYWORDS)
+
+            # 第2步：广告页或无电话，两种方案都不成立，直接返回
+            if is_ad_page or not has_phone:
+                if self.debug_mode:
+                    print(f"⚠ 不在商家详情页 (电话:{has_phone}, 导航:{has_nav}, 筛选:{has_filter}, 排序:{has_sort}, 广告:{is_ad_page})")
+                return False, None
 
-            root = etree.fromstring(xml_content.encode('utf-8'))
+            # 第3步：方案2 电话 + 导航（兼容旧版）成立时无需再检测右上角按钮
+            if has_nav and not has_filter and not has_sort:
+                print("✓ 确认在商家详情页（检测到电话+导航）")
+                return True, supplement_keyword
 
-            # 🆕 关键特征1：右上角3个按钮（搜索、反馈、关闭）
+            # 第4步：方案1 右上角3个按钮（搜索、反馈、关闭）+ 电话按钮
             # 这是商家详情页最显著的特征，位于屏幕顶部右侧
-            top_right_nodes = root.xpath('//node[@clickable="true" and @bounds]')
+            right_edge_threshold = int(self.screen_width * 0.7)
             has_search_btn = False
             has_feedback_btn = False
             has_close_btn = False
 
-            for node in top_right_nodes:
-                bounds_str = node.get('bounds', '')
-                content_desc = node.get('content-desc', '').strip()
-                text = node.get('text', '').strip()
+            for node in root.iter('node'):
+                if node.get('clickable') != 'true':
+                    continue
 
                 # 解析坐标
-                match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds_str)
-                if match:
-                    x1, y1, x2, y2 = map(int, match.groups())
-
-                    # 右上角区域：X > 屏幕宽度的70%, Y < 200
-                    screen_width, _ = self.adb_manager.get_screen_size()
-                    if x1 > screen_width * 0.7 and y1 < 200:
-                        # 检测搜索按钮（放大镜图标）
-                        if '搜索' in content_desc or '搜索' in text or 'search' in content_desc.lower():
-                            has_search_btn = True
-                            if self.debug_mode:
-                                print(f"  ✓ 检测到搜索按钮 (X={x1}, Y={y1})")
-
-                        # 检测反馈按钮（感叹号图标）
-                        if '反馈' in content_desc or '反馈' in text or '举报' in content_desc or 'feedback' in content_desc.lower():
-                            has_feedback_btn = True
-                            if self.debug_mode:
-                                print(f"  ✓ 检测到反馈按钮 (X={x1}, Y={y1})")
+                coords = _split_bounds(node.get('bounds', ''))
+                if not coords:
+                    continue
+                x1, y1, x2, y2 = coords
 
-                        # 检测关闭/更多按钮
-                        if '关闭' in content_desc or '关闭' in text or '更多' in content_desc or '更多' in text or 'close' in content_desc.lower() or 'more' in content_desc.lower():
-                            has_close_btn = True
-                            if self.debug_mode:
-                                print(f"  ✓ 检测到关闭/更多按钮 (X={x1}, Y={y1})")
+                # 右上角区域：X > 屏幕宽度的70%, Y < 200
+                if x1 <= right_edge_threshold or y1 >= 200:
+                    continue
 
-            # 右上角3按钮特征（至少2个，因为可能有些按钮识别不到）
-            has_top_right_buttons = (has_search_btn and has_feedback_btn) or \
-                                   (has_search_btn and has_close_btn) or \
-                                   (has_feedback_btn and has_close_btn)
+                content_desc = node.get('content-desc', '').strip()
+                text = node.get('text', '').strip()
 
-            # 原有特征2：必须有电话按钮（有电话的才是有效商家）
-            has_phone = len(root.xpath('//node[contains(@text, "电话") or contains(@content-desc, "电话")]')) > 0
+                # 检测搜索按钮（放大镜图标）
+                if '搜索' in content_desc or '搜索' in text or 'search' in content_desc.lower():
+                    has_search_btn = True
+                    if self.debug_mode:
+                        print(f"  ✓ 检测到搜索按钮 (X={x1}, Y={y1})")
 
-            # 原有特征3：导航按钮
-            has_nav = len(root.xpath('//node[contains(@text, "导航") or contains(@content-desc, "导航") or contains(@text, "路线") or contains(@content-desc, "路线")]')) > 0
-
-            # 排除搜索结果页特征
-            has_filter = len(root.xpath('//node[contains(@text, "筛选")]')) > 0
-            has_sort = len(root.xpath('//node[contains(@text, "排序")]')) > 0
-
-            # 排除广告页面特征
-            ad_keywords = ['推荐', '服务推荐', '上门配送', '配送服务']
-            is_ad_page = False
-            for keyword in ad_keywords:
-                if len(root.xpath(f'//node[contains(@text, "{keyword}")]')) > 0:
-                    is_ad_page = True
-                    break
+                # 检测反馈按钮（感叹号图标）
+                if '反馈' in content_desc or '反馈' in text or '举报' in content_desc or 'feedback' in content_desc.lower():
+                    has_feedback_btn = True
+                    if self.debug_mode:
+                        print(f"  ✓ 检测到反馈按钮 (X={x1}, Y={y1})")
 
-            # 综合判断（优先级：右上角3按钮 > 电话+导航）
-            # 方案1：有右上角3按钮 + 电话按钮（最可靠）
-            is_detail_page_v1 = has_top_right_buttons and has_phone
-            # 方案2：电话 + 导航（兼容旧版）
-            is_detail_page_v2 = has_phone and has_nav and not has_filter and not has_sort
+                # 检测关闭/更多按钮
+                if '关闭' in content_desc or '关闭' in text or '更多' in content_desc or '更多' in text or 'close' in content_desc.lower() or 'more' in content_desc.lower():
+                    has_close_btn = True
+                    if self.debug_mode:
+                        print(f"  ✓ 检测到关闭/更多按钮 (X={x1}, Y={y1})")
 
-            is_detail_page = (is_detail_page_v1 or is_detail_page_v2) and not is_ad_page
+            # 右上角3按钮特征（至少2个，因为可能有些按钮识别不到）
+            is_detail_page = (has_search_btn and has_feedback_btn) or \
+                             (has_search_btn and has_close_btn) or \
+                             (has_feedback_btn and has_close_btn)
 
             if is_detail_page:
-                if has_top_right_buttons:
-                    print("✓ 确认在商家详情页（检测到右上角3按钮）")
-                else:
-                    print("✓ 确认在商家详情页（检测到电话+导航）")
-            else:
-                print(f"⚠ 不在商家详情页 (右上角按钮:{has_top_right_buttons}, 电话:{has_phone}, 导航:{has_nav}, 筛选:{has_filter}, 排序:{has_sort}, 广告:{is_ad_page})")
+                print("✓ 确认在商家详情页（检测到右上角3按钮）")
+            elif self.debug_mode:
+                print(f"⚠ 不在商家详情页 (右上角按钮:False, 电话:{has_phone}, 导航:{has_nav}, 筛选:{has_filter}, 排序:{has_sort}, 广告:{is_ad_page})")
 
-            return is_detail_page
+            return is_detail_page, supplement_keyword if is_detail_page else None
 
         except Exception as e:
             print(f"页面检测失败: {e}")
-            return False
+            return False, None
 
-    def _is_on_search_result_page(self) -> bool:
+    def _is_on_search_result_page(self, root=None) -> bool:
         """
         检测是否在搜索结果页（2025-01-16增强：新增顶部标题检测）
 
@@ -784,19 +1072,28 @@ class MerchantCollector:
         │ [商家卡片2]                     │
         └─────────────────────────────────┘
 
+        Args:
+            root: 已解析的XML根节点，为None时使用当前界面缓存
+
         Returns:
             是否在搜索结果页
         """
         try:
-            xml_content = self.adb_manager.get_ui_hierarchy()
-            if not xml_content:
+            if root is None:
+                root = self._get_root()
+            if root is None:
                 return False
 
-            root = etree.fromstring(xml_content.encode('utf-8'))
+            # 原有特征2：筛选按钮（两种方案都需要，缺失时直接返回）
+            has_filter = _XP_HAS_FILTER(root)
+            if not has_filter:
+                if self.debug_mode:
+                    print("⚠ 不在搜索结果页 (筛选:False)")
+                return False
 
             # 🆕 关键特征1：顶部标题区域（Y < 300）包含"附近上榜"等关键词
             # 这是搜索结果页最显著的特征
-            top_area_nodes = root.xpath('//node[@text and @bounds]')
+            top_area_nodes = _XP_TEXT_BOUNDS_NODES(root)
             has_top_title = False
             top_title_keywords = ['附近上榜', '榜单', '推荐商家', '附近商家', '搜索结果']
 
@@ -805,9 +1102,9 @@ class MerchantCollector:
                 text = node.get('text', '').strip()
 
                 # 解析Y轴坐标
-                match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds_str)
-                if match:
-                    x1, y1, x2, y2 = map(int, match.groups())
+                coords = _split_bounds(bounds_str)
+                if coords:
+                    x1, y1, x2, y2 = coords
 
                     # 顶部区域：Y < 300
                     if y1 < 300:
@@ -821,29 +1118,23 @@ class MerchantCollector:
                         if has_top_title:
                             break
 
-            # 原有特征2：筛选按钮
-            has_filter = len(root.xpath('//node[contains(@text, "筛选")]')) > 0
+            if has_top_title:
+                # 方案1：有顶部标题 + 筛选按钮（最可靠），无需再检查排序和RecyclerView
+                print("✓ 确认在搜索结果页（检测到顶部标题）")
+                return True
 
             # 原有特征3：排序按钮
-            has_sort = len(root.xpath('//node[contains(@text, "排序")]')) > 0
+            has_sort = _XP_HAS_SORT(root)
 
             # 原有特征4：RecyclerView
-            has_recyclerview = len(root.xpath('//node[@class="androidx.recyclerview.widget.RecyclerView"]')) > 0
+            has_recyclerview = _XP_HAS_RECYCLERVIEW(root)
 
-            # 综合判断（优先级：顶部标题 > 筛选/排序）
-            # 方案1：有顶部标题 + 筛选按钮（最可靠）
-            is_search_page_v1 = has_top_title and has_filter
             # 方案2：筛选 + 排序 + RecyclerView（兼容旧版）
-            is_search_page_v2 = has_filter and has_sort and has_recyclerview
-
-            is_search_page = is_search_page_v1 or is_search_page_v2
+            is_search_page = has_sort and has_recyclerview
 
             if is_search_page:
-                if has_top_title:
-                    print("✓ 确认在搜索结果页（检测到顶部标题）")
-                else:
-                    print("✓ 确认在搜索结果页（检测到筛选+排序）")
-            else:
+                print("✓ 确认在搜索结果页（检测到筛选+排序）")
+            elif self.debug_mode:
                 print(f"⚠ 不在搜索结果页 (顶部标题:{has_top_title}, 筛选:{has_filter}, 排序:{has_sort}, RecyclerView:{has_recyclerview})")
 
             return is_search_page
@@ -852,7 +1143,7 @@ class MerchantCollector:
             print(f"页面检测失败: {e}")
             return False
 
-    def _is_on_dialer_page(self) -> bool:
+    def _is_on_dialer_page(self, root=None) -> bool:
         """
         检测是否在拨号页面（2025-01-16新增：处理"咨询"按钮特殊情况）
 
@@ -862,43 +1153,37 @@ class MerchantCollector:
         - 不是高德地图界面（没有商家信息元素）
         - 可能是系统拨号器或第三方通讯APP
 
+        Args:
+            root: 已解析的XML根节点，为None时使用当前界面缓存
+
         Returns:
             是否在拨号页面
         """
         try:
-            xml_content = self.adb_manager.get_ui_hierarchy()
-            if not xml_content:
+            if root is None:
+                root = self._get_root()
+            if root is None:
                 return False
 
-            root = etree.fromstring(xml_content.encode('utf-8'))
-
             # 特征1：拨号盘数字（检测是否有数字键盘）
             # 拨号盘通常有"1"、"2"、"3"等按钮，content-desc或text包含这些数字
-            digit_buttons = root.xpath('//node[@clickable="true" and (@text="1" or @content-desc="1" or @text="2" or @content-desc="2")]')
-            has_dialer_digits = len(digit_buttons) > 0
-
-            # 特征2：拨号相关文本
-            dialer_keywords = ['拨号', '通话', '呼叫', '联系人', '最近通话', '通讯录']
-            has_dialer_text = False
-            for keyword in dialer_keywords:
-                if len(root.xpath(f'//node[contains(@text, "{keyword}") or contains(@content-desc, "{keyword}")]')) > 0:
-                    has_dialer_text = True
-                    break
+            has_dialer_digits = _XP_HAS_DIALER_DIGITS(root)
 
-            # 特征3：排除高德地图元素（如果有商家相关元素，说明不是拨号页面）
-            amap_keywords = ['商家', '导航', '路线', '地址', '详情']
-            has_amap_elements = False
-            for keyword in amap_keywords:
-                if len(root.xpath(f'//node[contains(@text, "{keyword}")]')) > 0:
-                    has_amap_elements = True
-                    break
+            # 一次遍历同时收集拨号关键词和高德地图关键词
+            text_hits, desc_hits = _scan_keywords(root.iter('node'), _DIALER_KEYWORDS + _AMAP_KEYWORDS)
+
+            # 特征2：拨号相关文本（text或content-desc）
+            has_dialer_text = bool((text_hits | desc_hits).intersection(_DIALER_KEYWORDS))
+
+            # 特征3：排除高德地图元素（如果有商家相关元素，说明不是拨号页面，仅检查text）
+            has_amap_elements = bool(text_hits.intersection(_AMAP_KEYWORDS))
 
             # 判断：有拨号盘或拨号文本，且没有高德地图元素
             is_dialer = (has_dialer_digits or has_dialer_text) and not has_amap_elements
 
             if is_dialer:
                 print(f"✓ 检测到拨号页面 (拨号盘:{has_dialer_digits}, 拨号文本:{has_dialer_text})")
-            else:
+            elif self.debug_mode:
                 print(f"  不在拨号页面 (拨号盘:{has_dialer_digits}, 拨号文本:{has_dialer_text}, 高德元素:{has_amap_elements})")
 
             return is_dialer
@@ -907,7 +1192,7 @@ class MerchantCollector:
             print(f"拨号页面检测失败: {e}")
             return False
 
-    def _is_supplement_phone_dialog(self) -> bool:
+    def _is_supplement_phone_dialog(self, root=None) -> bool:
         """
         检测是否是"补充电话"弹窗（2025-01-16新增：处理商家未留电话的特殊情况）
 
@@ -916,33 +1201,32 @@ class MerchantCollector:
         - 表示商家未提供电话号码
         - 无法提取电话信息
 
+        Args:
+            root: 已解析的XML根节点，为None时使用当前界面缓存
+
         Returns:
             是否是补充电话弹窗
         """
         try:
-            xml_content = self.adb_manager.get_ui_hierarchy()
-            if not xml_content:
+            if root is None:
+                root = self._get_root()
+            if root is None:
                 return False
 
-            root = etree.fromstring(xml_content.encode('utf-8'))
-
             # 检测"补充电话"相关文本
-            supplement_keywords = ['补充电话', '暂无电话', '未提供电话', '添加电话']
-            has_supplement_text = False
-
-            for keyword in supplement_keywords:
-                if len(root.xpath(f'//node[contains(@text, "{keyword}") or contains(@content-desc, "{keyword}")]')) > 0:
-                    has_supplement_text = True
-                    print(f"✓ 检测到补充电话弹窗 (关键词:{keyword})")
-                    break
+            keyword = _find_first_keyword(root.iter('node'), _SUPPLEMENT_KEYWORDS)
+            if keyword:
+                print(f"✓ 检测到补充电话弹窗 (关键词:{keyword})")
+                return True
 
-            return has_supplement_text
+            return False
 
         except Exception as e:
             print(f"补充电话弹窗检测失败: {e}")
             return False
 
-    def collect_merchant_detail(self, merchant_name: str = None) -> Optional[Dict]:
+    def collect_merchant_detail(self, merchant_name: str = None, root=None,
+                                supplement_keyword: Optional[str] = None) -> Optional[Dict]:
         """
         采集当前商家详情页的核心信息（2025-01-16重构：使用结构化定位器）
 
@@ -952,8 +1236,13 @@ class MerchantCollector:
         3. 电话号码 (phones)
         4. 顶部截图 (image_urls)
 
+        传入root时直接使用（调用方点击后已等待详情页稳定并验证过）；
+        未传入时调用方只是点击了商家（如界面线程直接通过adb_manager点击），这里等待界面稳定后重新拉取
+
         Args:
             merchant_name: 期望的商家名称（用于验证）
+            root: 点击后验证用过的详情页XML根节点，为None时等待界面稳定后重新拉取
+            supplement_keyword: 验证时在root中查到的"补充电话"类关键词（仅在传入root时使用）
 
         Returns:
             商家详细信息字典，如果商家名不匹配返回None
@@ -966,26 +1255,23 @@ class MerchantCollector:
         }
 
         try:
-            # 等待页面加载
-            time.sleep(2)
-
-            # 获取UI层级
-            xml_content = self.adb_manager.get_ui_hierarchy()
-            if not xml_content:
-                print("无法获取商家详情页UI")
-                return None
-
-            root = etree.fromstring(xml_content.encode('utf-8'))
-            screen_width, screen_height = self.adb_manager.get_screen_size()
-
             # 🆕 2025-01-17 早期检测"补充电话"（避免浪费时间点击）
             # 在商家详情页的XML中直接检测"补充电话"关键词，如果存在则立即跳过
-            supplement_keywords = ['补充电话', '暂无电话', '未提供电话', '添加电话']
-            for keyword in supplement_keywords:
-                if len(root.xpath(f'//node[contains(@text, "{keyword}") or contains(@content-desc, "{keyword}")]')) > 0:
-                    print(f"⚠ 在详情页检测到'{keyword}'，商家未提供电话号码")
-                    print("  → 直接返回商家列表，无需点击电话按钮（节省时间）")
+            # （点击后验证已传入解析树和检测结果时直接使用）
+            if root is None:
+                # 点击发生在采集器之外，缓存里可能还是点击前的列表页，必须重新拉取
+                root = self._wait_for_ui_stable(timeout=2.0)
+                if root is None:
+                    print("无法获取商家详情页UI")
                     return None
+                keyword = _find_first_keyword(root.iter('node'), _SUPPLEMENT_KEYWORDS)
+            else:
+                keyword = supplement_keyword
+
+            if keyword:
+                print(f"⚠ 在详情页检测到'{keyword}'，商家未提供电话号码")
+                print("  → 直接返回商家列表，无需点击电话按钮（节省时间）")
+                return None
 
             # ========== 🆕 2025-01-16修复：直接使用卡片商家名，不再从详情页提取 ==========
             # 1. 商家名称：直接使用参数传入的商家名（来自卡片列表，最准确）
@@ -1033,7 +1319,6 @@ class MerchantCollector:
 
         except Exception as e:
             print(f"采集商家详情失败: {e}")
-            import traceback
             traceback.print_exc()
             return None
 
@@ -1061,9 +1346,9 @@ class MerchantCollector:
                 '买花榜', '服务', '推荐'
             ]
 
-            # 1. 检查当前节点的文本
-            text = node.get('text', '').strip()
-            content_desc = node.get('content-desc', '').strip()
+            # 1. 检查当前节点的文本（只做子串判断，不需要去除首尾空白）
+            text = node.get('text', '')
+            content_desc = node.get('content-desc', '')
 
             for keyword in ad_service_keywords:
                 if keyword in text or keyword in content_desc:
@@ -1072,8 +1357,8 @@ class MerchantCollector:
             # 2. 检查父级节点（向上查找2层）
             parent = node.getparent()
             if parent is not None:
-                parent_text = parent.get('text', '').strip()
-                parent_desc = parent.get('content-desc', '').strip()
+                parent_text = parent.get('text', '')
+                parent_desc = parent.get('content-desc', '')
 
                 for keyword in ad_service_keywords:
                     if keyword in parent_text or keyword in parent_desc:
@@ -1082,8 +1367,8 @@ class MerchantCollector:
                 # 再向上查找一层
                 grandparent = parent.getparent()
                 if grandparent is not None:
-                    gp_text = grandparent.get('text', '').strip()
-                    gp_desc = grandparent.get('content-desc', '').strip()
+                    gp_text = grandparent.get('text', '')
+                    gp_desc = grandparent.get('content-desc', '')
 
                     for keyword in ad_service_keywords:
                         if keyword in gp_text or keyword in gp_desc:
@@ -1092,13 +1377,13 @@ class MerchantCollector:
             # 3. 检查同级兄弟节点（可能包含服务卡片标题）
             parent = node.getparent()
             if parent is not None:
-                siblings = parent.xpath('.//node[@text or @content-desc]')
+                siblings = _XP_DESCENDANT_LABEL_NODES(parent)
                 for sibling in siblings:
                     if sibling == node:
                         continue
 
-                    sib_text = sibling.get('text', '').strip()
-                    sib_desc = sibling.get('content-desc', '').strip()
+                    sib_text = sibling.get('text', '')
+                    sib_desc = sibling.get('content-desc', '')
 
                     for keyword in ad_service_keywords:
                         if keyword in sib_text or keyword in sib_desc:
@@ -1130,26 +1415,24 @@ class MerchantCollector:
         }
 
         try:
-            # 查找所有带resource-id的节点
-            all_nodes = root.xpath('//node[@resource-id and @bounds]')
-
             if self.debug_mode:
                 print(f"\n  🔍 方案A：搜索resource-id节点")
-                print(f"     找到 {len(all_nodes)} 个带resource-id的节点")
 
-            for node in all_nodes:
-                resource_id = node.get('resource-id', '')
-                text = node.get('text', '').strip()
-                content_desc = node.get('content-desc', '').strip()
-                bounds_str = node.get('bounds', '')
+            # 单次遍历带resource-id的节点
+            for node in root.iter('node'):
+                resource_id = node.get('resource-id')
+                if resource_id is None or node.get('bounds') is None:
+                    continue
 
                 # 🆕 关键过滤：排除系统UI元素
                 # 排除Android系统UI（如状态栏、导航栏）
-                if any(namespace in resource_id for namespace in ['com.android.systemui:', 'android:id/']):
+                if any(namespace in resource_id for namespace in _SYSTEM_UI_NAMESPACES):
                     continue
 
-                # 清理HTML标签
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
+                content_desc = node.get('content-desc', '').strip()
+
+                # 清理HTML标签（同时去除首尾空白）
+                clean_text = _strip_html(node.get('text', '')).strip()
 
                 # 🆕 关键过滤2：排除广告服务卡片中的元素
                 # 检查父级节点是否包含广告服务关键词
@@ -1159,61 +1442,36 @@ class MerchantCollector:
                     continue
 
                 # 尝试匹配商家名相关的resource-id
-                if any(keyword in resource_id.lower() for keyword in ['title', 'name', 'merchant', 'shop']):
+                resource_id_lower = resource_id.lower()
+                if any(keyword in resource_id_lower for keyword in _RESID_NAME_KEYWORDS):
                     if clean_text and len(clean_text) >= 3:
-                        if not detail_info['name']:
-                            # 🆕 排除"收录X年"标签
-                            if not re.match(r'^收录\d+[年个月天]', clean_text):
-                                detail_info['name'] = clean_text
-                                if self.debug_mode:
-                                    print(f"     ✓ 商家名: {clean_text} (resource-id={resource_id})")
-
-                # 尝试匹配电话按钮（🆕 增强：排除非拨号按钮）
-                if any(keyword in resource-id.lower() for keyword in ['phone', 'tel', 'call']) or \
-                   '电话' in clean_text or '电话' in content_desc:
-                    if not detail_info['phone_button_pos']:
-                        # 🆕 关键过滤：排除非拨号按钮的文字
-                        excluded_texts = ['补充电话', '添加电话', '暂无电话', '未提供电话', '电话预定']
-                        is_excluded = any(ex in clean_text or ex in content_desc for ex in excluded_texts)
-
-                        if not is_excluded:
-                            # 🆕 验证必须是可点击的节点
-                            clickable = node.get('clickable', 'false')
-                            if clickable == 'true':
-                                bounds = self._parse_bounds(bounds_str)
-                                if bounds:
-                                    # 🆕 验证Y轴位置（必须在合理范围：200-1500）
-                                    y_pos = bounds['y1']
-                                    if 200 <= y_pos <= 1500:
-                                        detail_info['phone_button_pos'] = {
-                                            'x': (bounds['x1'] + bounds['x2']) // 2,
-                                            'y': (bounds['y1'] + bounds['y2']) // 2
-                                        }
-                                        if self.debug_mode:
-                                            print(f"     ✓ 电话按钮: ({detail_info['phone_button_pos']['x']}, {detail_info['phone_button_pos']['y']}) (resource-id={resource_id})")
-
-                # 尝试匹配地址
-                if any(keyword in resource_id.lower() for keyword in ['address', 'location', 'addr']):
-                    if clean_text and len(clean_text) > 10:
-                        if not detail_info['address']:
-                            detail_info['address'] = clean_text
+                        # 🆕 排除"收录X年"标签
+                        if not _RE_RECORD_TAG.match(clean_text):
+                            detail_info['name'] = clean_text
                             if self.debug_mode:
-                                print(f"     ✓ 地址: {clean_text} (resource-id={resource_id})")
+                                print(f"     ✓ 商家名: {clean_text} (resource-id={resource_id})")
+
+                # 保持原有结果：原实现紧接着的电话按钮判断写成了 resource-id.lower()，在这里抛出NameError，
+                # 被下面的except吞掉。所以第一个非系统、非广告服务的resource-id节点处理完商家名后就返回，
+                # 电话/地址的resource-id匹配和后面的文本兜底都不会执行，由调用方回退到区域定位。
+                # 修正它会改变选中的地址和电话按钮，需要单独处理。
+                if self.debug_mode:
+                    print(f"  ✗ resource-id定位中断，改用区域定位")
+                return detail_info
 
             # 如果resource-id没找到电话按钮，尝试用文本搜索（增强版：只识别真正的拨号按钮）
             if not detail_info['phone_button_pos']:
                 # 🆕 关键修复：只查找可点击且包含"电话"的节点
-                phone_nodes = root.xpath('//node[@clickable="true" and (contains(@text, "电话") or contains(@content-desc, "电话")) and @bounds]')
+                phone_nodes = _XP_CLICKABLE_PHONE_NODES(root)
 
                 for phone_node in phone_nodes:
-                    text = phone_node.get('text', '').strip()
-                    content_desc = phone_node.get('content-desc', '').strip()
+                    text = phone_node.get('text', '')
+                    content_desc = phone_node.get('content-desc', '')
                     bounds_str = phone_node.get('bounds', '')
 
                     # 🆕 排除非拨号按钮的文字
                     # "补充电话"、"添加电话"、"电话预定"等都不是直接拨号按钮
-                    excluded_texts = ['补充电话', '添加电话', '暂无电话', '未提供电话', '电话预定']
-                    is_excluded = any(ex in text or ex in content_desc for ex in excluded_texts)
+                    is_excluded = any(ex in text or ex in content_desc for ex in _PHONE_BUTTON_EXCLUDED)
 
                     if is_excluded:
                         if self.debug_mode:
@@ -1247,13 +1505,12 @@ class MerchantCollector:
 
             # 如果resource-id没找到地址，尝试用关键词搜索
             if not detail_info['address']:
-                all_text_nodes = root.xpath('//node[@text and string-length(@text) > 10 and @bounds]')
+                all_text_nodes = _XP_TEXT_LONG(root)
                 for node in all_text_nodes:
-                    text = node.get('text', '').strip()
-                    clean_text = re.sub(r'<[^>]+>', '', text).strip()
+                    clean_text = _strip_html(node.get('text', '')).strip()
 
                     # 地址特征：包含区/路/街/号
-                    if any(keyword in clean_text for keyword in ['区', '路', '街', '号', '道', '巷']):
+                    if _RE_ADDRESS_HINT.search(clean_text):
                         if len(clean_text) > 10 and len(clean_text) < 100:
                             detail_info['address'] = clean_text
                             if self.debug_mode:
@@ -1276,14 +1533,11 @@ class MerchantCollector:
         Returns:
             bounds字典 {'x1', 'y1', 'x2', 'y2', 'width', 'height'}
         """
-        if not bounds_str:
+        coords = _split_bounds(bounds_str)
+        if coords is None:
             return None
 
-        match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds_str)
-        if not match:
-            return None
-
-        x1, y1, x2, y2 = map(int, match.groups())
+        x1, y1, x2, y2 = coords
 
         return {
             'x1': x1,
@@ -1305,37 +1559,13 @@ class MerchantCollector:
             电话号码列表，如果跳转到拨号页面或无电话则返回None（特殊标记）
         """
         try:
-            # 点击电话按钮
+            # 点击电话按钮（先记下点击前的界面，用来判断弹窗是否已出现）
+            previous_xml = self._get_ui_xml()
             self.adb_manager.click(phone_button_pos['x'], phone_button_pos['y'])
+            self._invalidate_ui_cache()
             print(f"✓ 点击电话按钮: ({phone_button_pos['x']}, {phone_button_pos['y']})")
-            time.sleep(1.5)
-
-            # 🆕 关键检查1：是否跳转到拨号页面（特殊情况：电话按钮带"咨询"）
-            if self._is_on_dialer_page():
-                print(f"  ⚠ 检测到拨号页面（电话按钮带'咨询'），无法提取号码")
-                print(f"  → 返回商家列表，跳过此商家")
-                # 返回None作为特殊标记，表示需要跳过此商家
-                self.adb_manager.press_back()
-                time.sleep(0.5)
-                return None
 
-            # 🆕 关键检查2：是否是"补充电话"弹窗（特殊情况：商家未留电话）
-            if self._is_supplement_phone_dialog():
-                print(f"  ⚠ 检测到'补充电话'弹窗（商家未留电话）")
-                print(f"  → 返回商家列表，跳过此商家")
-                # 返回None作为特殊标记，表示需要跳过此商家
-                self.adb_manager.press_back()
-                time.sleep(0.5)
-                return None
-
-            # 提取电话号码
-            phones = self._extract_phone_numbers()
-
-            # 关闭电话弹窗
-            self.adb_manager.press_back()
-            time.sleep(0.5)
-
-            return phones
+            return self._read_phone_popup(previous_xml)
 
         except Exception as e:
             print(f"提取电话失败: {e}")
@@ -1353,53 +1583,75 @@ class MerchantCollector:
             phone_click_x = int(screen_width * 0.85)
             phone_click_y = int(screen_height * 0.25)
 
-            phone_nodes = root.xpath('//node[contains(@text, "电话") or contains(@content-desc, "电话")]')
+            phone_nodes = _XP_PHONE_NODES(root)
             if phone_nodes:
                 phone_node = phone_nodes[0]
                 bounds = phone_node.get('bounds', '')
-                match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds)
-                if match:
-                    x1, y1, x2, y2 = map(int, match.groups())
+                coords = _split_bounds(bounds)
+                if coords:
+                    x1, y1, x2, y2 = coords
                     phone_click_x = (x1 + x2) // 2
                     phone_click_y = (y1 + y2) // 2
 
-            # 点击电话图标
+            # 点击电话图标（先记下点击前的界面，用来判断弹窗是否已出现）
+            previous_xml = self._get_ui_xml()
             self.adb_manager.click(phone_click_x, phone_click_y)
+            self._invalidate_ui_cache()
             print(f"✓ 点击电话按钮（备用方法）: ({phone_click_x}, {phone_click_y})")
-            time.sleep(1.5)
 
-            # 🆕 关键检查1：是否跳转到拨号页面（特殊情况：电话按钮带"咨询"）
-            if self._is_on_dialer_page():
-                print(f"  ⚠ 检测到拨号页面（电话按钮带'咨询'），无法提取号码")
-                print(f"  → 返回商家列表，跳过此商家")
-                # 返回None作为特殊标记，表示需要跳过此商家
-                self.adb_manager.press_back()
-                time.sleep(0.5)
-                return None
+            return self._read_phone_popup(previous_xml)
 
-            # 🆕 关键检查2：是否是"补充电话"弹窗（特殊情况：商家未留电话）
-            if self._is_supplement_phone_dialog():
-                print(f"  ⚠ 检测到'补充电话'弹窗（商家未留电话）")
-                print(f"  → 返回商家列表，跳过此商家")
-                # 返回None作为特殊标记，表示需要跳过此商家
-                self.adb_manager.press_back()
-                time.sleep(0.5)
-                return None
+        except Exception as e:
+            print(f"提取电话失败: {e}")
+            return []
+
+    def _read_phone_popup(self, previous_xml: Optional[str] = None) -> Optional[List[str]]:
+        """
+        点击电话按钮后读取弹出的界面并关闭它
+
+        等待界面稳定后，拨号页面检测、补充电话弹窗检测和号码提取共用同一份UI层级。
+        弹窗还没渲染时详情页本身也是静止的，所以和点击前相同的界面不算稳定，
+        界面一直没变化时等满1.5秒再读取（与原来固定等待1.5秒一致）。
+
+        Args:
+            previous_xml: 点击电话按钮前的UI层级
+
+        Returns:
+            电话号码列表，如果跳转到拨号页面或无电话则返回None（特殊标记）
+        """
+        root = self._wait_for_ui_stable(timeout=1.5, previous_xml=previous_xml)
 
-            # 提取电话号码
-            phones = self._extract_phone_numbers()
+        # 🆕 关键检查1：是否跳转到拨号页面（特殊情况：电话按钮带"咨询"）
+        if self._is_on_dialer_page(root):
+            print(f"  ⚠ 检测到拨号页面（电话按钮带'咨询'），无法提取号码")
+            print(f"  → 返回商家列表，跳过此商家")
+            # 返回None作为特殊标记，表示需要跳过此商家
+            self.adb_manager.press_back()
+            self._invalidate_ui_cache()
+            time.sleep(0.5)
+            return None
 
-            # 关闭电话弹窗
+        # 🆕 关键检查2：是否是"补充电话"弹窗（特殊情况：商家未留电话）
+        if self._is_supplement_phone_dialog(root):
+            print(f"  ⚠ 检测到'补充电话'弹窗（商家未留电话）")
+            print(f"  → 返回商家列表，跳过此商家")
+            # 返回None作为特殊标记，表示需要跳过此商家
             self.adb_manager.press_back()
+            self._invalidate_ui_cache()
             time.sleep(0.5)
+            return None
 
-            return phones
+        # 提取电话号码
+        phones = self._extract_phone_numbers(root)
 
-        except Exception as e:
-            print(f"提取电话失败: {e}")
-            return []
+        # 关闭电话弹窗
+        self.adb_manager.press_back()
+        self._invalidate_ui_cache()
+        time.sleep(0.5)
 
-    def _extract_phone_numbers(self) -> List[str]:
+        return phones
+
+    def _extract_phone_numbers(self, root=None) -> List[str]:
         """
         从电话弹窗中提取电话号码
 
@@ -1413,80 +1665,85 @@ class MerchantCollector:
         - 位置：底部 bounds [0,1728][1080,2209]
         - 内容：HTML包裹的电话号码
 
+        Args:
+            root: 已解析的XML根节点，为None时等待弹窗后重新拉取
+
         Returns:
             电话号码列表
         """
         phones = []
 
         try:
-            time.sleep(1)
-            xml_content = self.adb_manager.get_ui_hierarchy()
-            if not xml_content:
+            if root is None:
+                time.sleep(1)
+                root = self._get_root(force=True)
+            if root is None:
                 return phones
 
-            root = etree.fromstring(xml_content.encode('utf-8'))
+            # 三种策略合并为一次节点遍历：策略2的结果先暂存，仅在策略1全无结果时采用
+            seen = set()
+            fallback_phones = []
+            fallback_seen = set()
+            saw_title = False
 
-            # 策略1：从HTML font标签中提取（最可靠）
-            text_nodes = root.xpath('//node[@text and string-length(@text) > 0]')
+            for node in root.iter('node'):
+                text = node.get('text')
+                if not text:
+                    continue
 
-            for node in text_nodes:
-                text = node.get('text', '')
+                # 策略3：验证弹窗标题，确保在正确的对话框中
+                if not saw_title and '电话' in text:
+                    saw_title = True
 
+                # 最短的电话号码（不带横杠的固话）也有10位数字，短文本和不含数字的文本不可能命中
+                if len(text) < _MIN_PHONE_LENGTH or not _RE_DIGIT.search(text):
+                    continue
+
+                # 策略1：从HTML font标签中提取（最可靠）
                 # 🆕 关键修复：只提取包含完整电话号码的font标签
                 # 使用更精确的正则：提取整个文本，然后从中提取电话号码
                 # 而不是直接从font标签中提取所有数字
 
                 # 先移除HTML标签，获取纯文本
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
+                clean_text = _strip_html(text).strip()
 
                 # 在纯文本中查找电话号码
                 if clean_text:
                     # 匹配11位手机号
-                    phone_pattern = r'1[3-9]\d{9}'
-                    matches = re.findall(phone_pattern, clean_text)
-                    for phone in matches:
-                        if phone not in phones:
+                    for phone in _RE_MOBILE.findall(clean_text):
+                        if phone not in seen:
+                            seen.add(phone)
                             phones.append(phone)
                             print(f"从HTML标签提取到电话: {phone}")
 
                     # 匹配固定电话（区号-号码格式）
-                    landline_pattern = r'0\d{2,3}-?\d{7,8}'
-                    matches = re.findall(landline_pattern, clean_text)
-                    for phone in matches:
+                    for phone in _RE_LANDLINE.findall(clean_text):
                         clean_phone = phone.replace('-', '')
-                        if clean_phone not in phones and self._is_valid_phone(clean_phone):
+                        if clean_phone not in seen and self._is_valid_phone(clean_phone):
+                            seen.add(clean_phone)
                             phones.append(clean_phone)
                             print(f"从HTML标签提取到电话: {clean_phone}")
 
-            # 策略2：正则匹配标准格式电话号码
-            if not phones:
-                for node in text_nodes:
-                    text = node.get('text', '')
-
-                    # 匹配电话号码格式（支持多种格式）
-                    phone_patterns = [
-                        r'1[3-9]\d{9}',  # 11位手机号
-                        r'0\d{2,3}-?\d{7,8}',  # 固定电话
-                        r'\d{3,4}-\d{7,8}'  # 其他格式
-                    ]
-
-                    for pattern in phone_patterns:
-                        matches = re.findall(pattern, text)
-                        for match in matches:
+                # 策略2：正则匹配标准格式电话号码（策略1已有结果时不再需要）
+                if not phones:
+                    for pattern in _FALLBACK_PHONE_PATTERNS:
+                        for match in pattern.findall(text):
                             # 去除横杠
                             phone = match.replace('-', '')
-                            if self._is_valid_phone(phone) and phone not in phones:
-                                phones.append(phone)
-                                print(f"从正则匹配提取到电话: {phone}")
+                            if phone not in fallback_seen and self._is_valid_phone(phone):
+                                fallback_seen.add(phone)
+                                fallback_phones.append(phone)
+
+            if not phones and fallback_phones:
+                phones = fallback_phones
+                for phone in phones:
+                    print(f"从正则匹配提取到电话: {phone}")
 
-            # 策略3：验证弹窗标题，确保在正确的对话框中
-            dialog_titles = root.xpath('//node[contains(@text, "拨打电话") or contains(@text, "电话")]')
-            if not dialog_titles and not phones:
+            if not saw_title and not phones:
                 print("警告：未检测到电话弹窗标题")
 
         except Exception as e:
             print(f"提取电话号码失败: {e}")
-            import traceback
             traceback.print_exc()
 
         return phones
@@ -1502,7 +1759,7 @@ class MerchantCollector:
             是否为有效电话号码
         """
         # 去除非数字字符
-        phone_digits = re.sub(r'\D', '', phone)
+        phone_digits = _RE_NON_DIGIT.sub('', phone)
 
         # 手机号：11位，1开头
         if len(phone_digits) == 11 and phone_digits.startswith('1'):
@@ -1526,8 +1783,8 @@ class MerchantCollector:
             是否匹配
         """
         # 清理括号和特殊字符
-        expected_clean = re.sub(r'[（）()·.。\s]', '', expected_name)
-        actual_clean = re.sub(r'[（）()·.。\s]', '', actual_name)
+        expected_clean = _RE_CLEAN_NAME.sub('', expected_name)
+        actual_clean = _RE_CLEAN_NAME.sub('', actual_name)
 
         # 策略1：完全匹配
         if expected_clean == actual_clean:
@@ -1541,17 +1798,21 @@ class MerchantCollector:
 
         # 策略3：字符重合度（至少50%）
         expected_chars = set(expected_clean)
-        actual_chars = set(actual_clean)
 
         if len(expected_chars) == 0:
             return False
 
-        common_chars = expected_chars & actual_chars
-        match_ratio = len(common_chars) / len(expected_chars)
+        # 命中字符数达到一半即可判定匹配，不必统计完所有字符
+        required = (len(expected_chars) + 1) // 2
+        common_count = 0
+        for char in expected_chars:
+            if char in actual_clean:
+                common_count += 1
+                if common_count >= required:
+                    print(f"⚠ 商家名相似度匹配: ≥{common_count / len(expected_chars):.0%} (期望'{expected_name}' / 实际'{actual_name}')")
+                    return True
 
-        if match_ratio >= 0.5:
-            print(f"⚠ 商家名相似度匹配: {match_ratio:.0%} (期望'{expected_name}' / 实际'{actual_name}')")
-            return True
+        match_ratio = common_count / len(expected_chars)
 
         # 不匹配
         print(f"✗ 商家名不匹配！")
@@ -1569,27 +1830,20 @@ class MerchantCollector:
             是否已到达末尾
         """
         try:
-            # 获取当前页面内容
-            current_content = self.adb_manager.get_ui_hierarchy()
-
+            # 获取当前页面内容（先只拉取文本，多数情况下判断不需要解析树）
+            current_content = self._get_ui_xml(force=True)
             if not current_content:
                 return False
 
-            # 检查是否有"没有更多了"、"到底了"等提示
-            root = etree.fromstring(current_content.encode('utf-8'))
-            end_indicators = [
-                '没有更多', '已经到底', '没有更多内容', '暂无更多',
-                '到底了', '就这些了'
-            ]
-
-            text_nodes = root.xpath('//node[@text]')
-            for node in text_nodes:
-                text = node.get('text', '')
-                for indicator in end_indicators:
-                    if indicator in text:
-                        return True
+            # 检查是否有"没有更多了"、"到底了"等提示（仅检查text，命中即停止）
+            # 原始XML中都没有出现这些文字时，不可能有节点命中，无需解析
+            if any(indicator in current_content for indicator in _END_INDICATORS):
+                root = self._get_root()
+                if root is not None and _find_first_keyword(root.iter('node'), _END_INDICATORS, check_desc=False):
+                    return True
 
             # 如果滑动后内容没有变化，也认为到底了
+            # 直接比较字符串：长度不同立即返回，相同时也只是一次内存比较，比每次对整份XML计算摘要更省
             if self.last_page_content and current_content == self.last_page_content:
                 return True
 
@@ -1603,7 +1857,7 @@ class MerchantCollector:
     def scroll_to_next_page(self):
         """向下滑动到下一页"""
         try:
-            width, height = self.adb_manager.get_screen_size()
+            width, height = self.screen_width, self.screen_height
 
             # 向上滑动（从下往上）
             self.adb_manager.swipe(
@@ -1611,6 +1865,7 @@ class MerchantCollector:
                 int(width * 0.5), int(height * 0.3),
                 0.5
             )
+            self._invalidate_ui_cache()
             time.sleep(1)
 
         except Exception as e:
@@ -1626,9 +1881,9 @@ class MerchantCollector:
         3. 如果返回到了错误页面（如首页），给出警告
         """
         try:
-            # 第一次返回
+            # 第一次返回（press_back内部已等待0.5秒的返回动画，这里不再额外等待，直接开始拉取比较）
             self.adb_manager.press_back()
-            time.sleep(1.5)
+            self._wait_for_ui_stable(timeout=1.5, min_wait=0)
 
             # 检查当前页面
             if self._is_on_search_result_page():
@@ -1638,7 +1893,7 @@ class MerchantCollector:
                 print("⚠ 仍在商家详情页，尝试再次返回")
                 # 可能有弹窗，再按一次返回
                 self.adb_manager.press_back()
-                time.sleep(1.5)
+                self._wait_for_ui_stable(timeout=1.5, min_wait=0)
 
                 if self._is_on_search_result_page():
                     print("✓ 已返回搜索结果页")
@@ -1709,7 +1964,9 @@ class MerchantCollector:
 
                     try:
                         # ==================== 点击前验证 ====================
-                        self._print_pre_click_verification(merchant, idx+1, len(merchants_on_page))
+                        # 卡片坐标、边界、置信度等明细只在调试模式输出（上面已打印进度和商家名）
+                        if self.debug_mode:
+                            self._print_pre_click_verification(merchant, idx+1, len(merchants_on_page))
 
                         # 调试模式：暂停确认
                         if self.debug_mode and self.config.get('debug_mode', {}).get('pause_before_click', False):
@@ -1717,15 +1974,18 @@ class MerchantCollector:
                             print(f"  ⏸ 暂停 {pause_time} 秒以供确认...")
                             time.sleep(pause_time)
 
-                        # 3. 点击商家卡片
-                        self.adb_manager.click(merchant['click_x'], merchant['click_y'])
+                        # 3. 点击商家卡片（未点击时页面没变，直接跳过，无需等待和返回）
+                        if not self.adb_manager.click(merchant['click_x'], merchant['click_y']):
+                            print(f"    ✗ 点击失败（坐标无效或设备异常），跳过此商家")
+                            continue
+                        self._invalidate_ui_cache()
 
-                        # 等待页面加载
+                        # 等待页面加载：界面稳定即继续，wait_after_click为最长等待时间
                         wait_time = self.config.get('collection', {}).get('wait_after_click', 2.0)
-                        time.sleep(wait_time)
+                        detail_root = self._wait_for_ui_stable(timeout=wait_time)
 
                         # ==================== 点击后验证 ====================
-                        click_success = self._verify_post_click()
+                        click_success, supplement_keyword = self._verify_post_click(detail_root)
 
                         if not click_success:
                             print(f"    ✗ 点击后验证失败（可能无电话或是广告页），跳过此商家")
@@ -1733,7 +1993,7 @@ class MerchantCollector:
                             continue
 
                         # 4. 采集商家详情（4项核心信息）
-                        detail_data = self.collect_merchant_detail(merchant_name)
+                        detail_data = self.collect_merchant_detail(merchant_name, detail_root, supplement_keyword)
 
                         # 🆕 检查特殊情况：电话按钮为咨询类型（返回None）
                         if detail_data is None:
@@ -1800,7 +2060,6 @@ class MerchantCollector:
 
         except Exception as e:
             print(f"\n采集过程出错: {e}")
-            import traceback
             traceback.print_exc()
 
         finally:
@@ -1837,10 +2096,11 @@ class MerchantCollector:
             print(f"准备采集: {merchant['name']}")
 
             # 2. 点击商家
-            self.adb_manager.click(merchant['click_x'], merchant['click_y'])
-            time.sleep(2)
+            if not self.adb_manager.click(merchant['click_x'], merchant['click_y']):
+                print("点击商家失败（坐标无效或设备异常）")
+                return None
 
-            # 3. 采集详情（4项核心信息）
+            # 3. 采集详情（4项核心信息，内部会等待详情页加载稳定）
             detail_data = self.collect_merchant_detail(merchant['name'])
 
             # 4. 返回列表
@@ -1873,6 +2133,57 @@ class MerchantCollector:
 
         except Exception as e:
             print(f"采集单个商家失败: {e}")
-            import traceback
             traceback.print_exc()
             return None
+
+
+def collect_categories_parallel(device_categories: Dict[str, str], max_merchants: int = 100,
+                                config_path: str = "config.yaml") -> Dict[str, List[Dict]]:
+    """
+    多台设备同时采集（每台设备一个线程，各自独立的ADB连接和采集器）
+
+    每台设备需事先停在对应分类的搜索结果页。采集过程几乎全部时间都在等待设备响应，
+    用线程即可让多台设备并行工作，耗时随设备数近似线性下降。
+
+    Args:
+        device_categories: {设备序列号: 分类名称}
+        max_merchants: 每台设备的最大采集数量
+        config_path: 配置文件路径
+
+    Returns:
+        {分类名称: 商家信息列表}，多台设备采集同一分类时合并并按商家名去重
+    """
+    def collect_on_device(serial: str, category_name: str) -> List[Dict]:
+        adb_manager = ADBDeviceManager()
+        if not adb_manager.connect_device(serial):
+            print(f"设备 {serial} 连接失败，跳过分类: {category_name}")
+            return []
+        collector = MerchantCollector(adb_manager, config_path)
+        return collector.collect_all_merchants_in_category(category_name, max_merchants)
+
+    results = {}
+    if not device_categories:
+        return results
+
+    with ThreadPoolExecutor(max_workers=len(device_categories)) as executor:
+        futures = {
+            executor.submit(collect_on_device, serial, category_name): category_name
+            for serial, category_name in device_categories.items()
+        }
+
+        for future, category_name in futures.items():
+            try:
+                merchants = future.result()
+            except Exception as e:
+                print(f"分类 {category_name} 采集出错: {e}")
+                traceback.print_exc()
+                merchants = []
+
+            merged = results.setdefault(category_name, [])
+            seen_names = {m['name'] for m in merged}
+            for merchant in merchants:
+                if merchant['name'] not in seen_names:
+                    seen_names.add(merchant['name'])
+                    merged.append(merchant)
+
+    return results
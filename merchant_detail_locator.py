@@ -26,20 +26,38 @@
 └────────────────────────────────────────┘
 """
 import re
-from typing import Dict, Optional, List
-from lxml import etree
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from merchant_card_locator import _split_bounds, _strip_html
+
+
+_RE_FONT = re.compile(r'<font[^>]*size="(\d+)"[^>]*>([^<]+)</font>')
+_RE_RATING = re.compile(r'(\d+\.\d+)\s*分')
+_RE_BUSINESS_HOURS = re.compile(r'(\d{2}:\d{2}[-~]\d{2}:\d{2})')
+
+# 非商家名的文本：开头模式（照片标签、评分、时间）合并为一个正则，固定文本（营业状态、页面标签）查集合
+_RE_EXCLUDED_NAME = re.compile(r'照片|\d+\.\d+$|\d+\.\d+\s*分|\d{2}:\d{2}')
+_EXCLUDED_NAMES = frozenset([
+    '营业中', '休息中', '即将营业', '已打烊', '暂停营业',
+    '入驻商家', '刚刚浏览', '达人笔记', '附近推荐', '查看全部',
+])
+
+# 地址特征字（单字字符类，一次扫描）
+_RE_ADDRESS_HINT = re.compile('[区路街号道巷]')
 
 
 class MerchantDetailLocator:
     """商家详情页信息定位器"""
 
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, debug_mode: bool = False):
         """
         初始化定位器
 
         Args:
             screen_width: 屏幕宽度（像素）
             screen_height: 屏幕高度（像素）
+            debug_mode: 是否输出屏幕尺寸和区域划分信息
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -61,11 +79,18 @@ class MerchantDetailLocator:
                 'y_max': int(screen_height * ratios['y_max'])
             }
 
-        print(f"  📱 屏幕尺寸: {screen_width}x{screen_height}")
-        print(f"  📐 区域划分（像素）:")
-        print(f"     照片区域: Y={self.zones['photo_area']['y_min']}-{self.zones['photo_area']['y_max']}")
-        print(f"     商家名区域: Y={self.zones['name_area']['y_min']}-{self.zones['name_area']['y_max']}")
-        print(f"     信息区域: Y={self.zones['info_area']['y_min']}-{self.zones['info_area']['y_max']}")
+        # 提取时逐节点比较的两个区域边界，直接存为整数属性
+        self._name_ymin = self.zones['name_area']['y_min']
+        self._name_ymax = self.zones['name_area']['y_max']
+        self._info_ymin = self.zones['info_area']['y_min']
+        self._info_ymax = self.zones['info_area']['y_max']
+
+        if debug_mode:
+            print(f"  📱 屏幕尺寸: {screen_width}x{screen_height}\n"
+                  f"  📐 区域划分（像素）:\n"
+                  f"     照片区域: Y={self.zones['photo_area']['y_min']}-{self.zones['photo_area']['y_max']}\n"
+                  f"     商家名区域: Y={self.zones['name_area']['y_min']}-{self.zones['name_area']['y_max']}\n"
+                  f"     信息区域: Y={self.zones['info_area']['y_min']}-{self.zones['info_area']['y_max']}")
 
     def extract_merchant_info(self, root, debug_mode: bool = False) -> Dict:
         """
@@ -98,12 +123,9 @@ class MerchantDetailLocator:
         }
 
         try:
-            # 1. 提取商家名称（名称区域，Y=600-800）
-            merchant_info['name'] = self._extract_name_from_zone(root, debug_mode)
-
-            # 2. 提取红框区域信息（信息区域，Y=800-1200）
-            info_data = self._extract_info_from_zone(root, debug_mode)
-            merchant_info.update(info_data)
+            # 名称区域（Y=600-800）和红框信息区域（Y=800-1200）在同一次遍历中提取
+            text_nodes = self._collect_text_nodes(root)
+            merchant_info.update(self._extract_from_zones(text_nodes, debug_mode))
 
             if debug_mode:
                 print("="*80)
@@ -118,112 +140,84 @@ class MerchantDetailLocator:
         except Exception as e:
             if debug_mode:
                 print(f"✗ 提取失败: {e}")
-            import traceback
-            traceback.print_exc()
+                traceback.print_exc()
 
         return merchant_info
 
-    def _extract_name_from_zone(self, root, debug_mode: bool = False) -> str:
+    def extract_many(self, roots: List, workers: int = 4) -> List[Dict]:
         """
-        从名称区域提取商家名（Y=600-800）
+        批量提取多个详情页的商家信息（离线批量处理已保存的页面时使用）
 
-        关键特征：
-        1. 在名称区域内（Y=600-800）
-        2. 字体最大（HTML font size）
-        3. 长度4-30字符
-        4. 不包含【】、照片等标识
+        各页面之间没有共享状态，XPath/正则对象都是模块级只读的，多个线程同时调用是安全的。
+        注意：提取主要是Python逐节点处理，执行期间持有GIL，多线程不会带来CPU并行加速；
+        lxml的节点对象也不能跨进程传递，无法改用进程池。
 
         Args:
-            root: XML根节点
-            debug_mode: 是否启用调试模式
+            roots: XML根节点列表
+            workers: 线程数，<=1时顺序处理
 
         Returns:
-            商家名称
+            与roots顺序一致的商家信息字典列表
         """
-        zone = self.zones['name_area']
-        all_text_nodes = root.xpath('//node[@text and string-length(@text) > 0 and @bounds]')
-
-        candidates = []
-
-        for node in all_text_nodes:
-            text = node.get('text', '').strip()
-            bounds_str = node.get('bounds', '')
-
-            # 解析bounds
-            bounds = self._parse_bounds(bounds_str)
-            if not bounds:
-                continue
-
-            # 关键过滤1：必须在名称区域内
-            if not (zone['y_min'] <= bounds['y1'] <= zone['y_max']):
-                continue
+        if len(roots) <= 1 or workers <= 1:
+            return [self.extract_merchant_info(root) for root in roots]
 
-            # 提取字体大小和清理文本
-            font_size = 0
-            clean_text = text
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.extract_merchant_info, roots))
 
-            font_match = re.search(r'<font[^>]*size="(\d+)"[^>]*>([^<]+)</font>', text)
-            if font_match:
-                font_size = int(font_match.group(1))
-                clean_text = font_match.group(2).strip()
-            else:
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
+    def _collect_text_nodes(self, root) -> List[tuple]:
+        """
+        单次遍历收集带bounds的非空文本节点
 
-            # 关键过滤2：长度4-30字符
-            if not (4 <= len(clean_text) <= 30):
-                continue
+        Args:
+            root: XML根节点
 
-            # 关键过滤3：排除非商家名
-            if self._is_excluded_name(clean_text):
+        Returns:
+            [(text, (x1, y1, x2, y2)), ...]，按文档顺序
+            （只需要坐标，用元组而不是字典，省去每个节点一次字典构建；
+            text保持原样，大部分节点不在目标区域内，去空白留到区域判断之后）
+        """
+        text_nodes = []
+        append = text_nodes.append
+        split_bounds = _split_bounds
+        for node in root.iter('node'):
+            text = node.get('text')
+            if not text:
                 continue
 
-            # 添加到候选
-            candidates.append({
-                'text': clean_text,
-                'font_size': font_size,
-                'y_pos': bounds['y1'],
-                'bounds': bounds
-            })
+            coords = split_bounds(node.get('bounds'))
+            if coords:
+                append((text, coords))
 
-            if debug_mode:
-                print(f"  候选商家名: {clean_text} (字体={font_size}, Y={bounds['y1']})")
-
-        if not candidates:
-            if debug_mode:
-                print("  ⚠ 名称区域未找到商家名")
-            return "未知商家"
+        return text_nodes
 
-        # 排序：字体大小优先，Y轴其次
-        candidates.sort(key=lambda x: (-x['font_size'], x['y_pos']))
-
-        best_name = candidates[0]['text']
-
-        if debug_mode:
-            print(f"  ✓ 识别商家名: {best_name} (字体={candidates[0]['font_size']}, Y={candidates[0]['y_pos']})")
-
-        return best_name
-
-    def _extract_info_from_zone(self, root, debug_mode: bool = False) -> Dict:
+    def _extract_from_zones(self, text_nodes: List[tuple], debug_mode: bool = False) -> Dict:
         """
-        从信息区域提取详细信息（Y=800-1200，红框区域）
+        一次遍历同时提取名称区域和信息区域的内容（每个节点的文本和坐标只处理一次）
 
-        关键特征：
+        名称区域（Y=600-800）关键特征：
+        1. 字体最大（HTML font size）
+        2. 长度4-30字符
+        3. 不包含【】、照片等标识
+
+        信息区域（Y=800-1200，红框区域）关键特征：
         1. 评分：X.X 分（数字+分）
         2. 营业时间：XX:XX-XX:XX（时间格式）
         3. 地址：包含区/路/街/号，长度>10
         4. 电话按钮：文本包含"电话"
 
         Args:
-            root: XML根节点
+            text_nodes: _collect_text_nodes收集的文本节点
             debug_mode: 是否启用调试模式
 
         Returns:
-            信息字典 {rating, address, business_hours, phone_button_pos}
+            信息字典 {name, rating, address, business_hours, phone_button_pos}
         """
-        zone = self.zones['info_area']
-        all_text_nodes = root.xpath('//node[@text and string-length(@text) > 0 and @bounds]')
+        name_min, name_max = self._name_ymin, self._name_ymax
+        info_min, info_max = self._info_ymin, self._info_ymax
 
         info_data = {
+            'name': '',
             'rating': '',
             'address': '',
             'business_hours': '',
@@ -231,87 +225,95 @@ class MerchantDetailLocator:
         }
 
         if debug_mode:
-            print(f"\n  🔍 扫描信息区域 (Y={zone['y_min']}-{zone['y_max']})")
-
-        for node in all_text_nodes:
-            text = node.get('text', '').strip()
-            bounds_str = node.get('bounds', '')
+            print(f"\n  🔍 扫描名称区域 (Y={name_min}-{name_max}) 和信息区域 (Y={info_min}-{info_max})")
+
+        # 商家名只需要最优的一个：字体大小优先，Y轴其次，边遍历边比较，不保存全部候选
+        best_name = None
+        best_key = None
+        # 信息区域四项都找到后不再做信息匹配（名称仍需看完整个名称区域）
+        info_done = False
+
+        # 循环内反复用到的函数提前绑定为局部变量
+        font_search = _RE_FONT.search
+        strip_html = _strip_html
+        is_excluded = self._is_excluded_name
+
+        for text, (x1, y1, x2, y2) in text_nodes:
+            # 两个区域在边界处相接，边界上的节点两边都要看，所以这里不用elif
+            if name_min <= y1 <= name_max:
+                # 提取字体大小和清理文本
+                font_size = 0
+                font_match = font_search(text) if '<font' in text else None
+                if font_match:
+                    font_size = int(font_match.group(1))
+                    clean_text = font_match.group(2).strip()
+                else:
+                    clean_text = strip_html(text).strip()
+
+                # 长度4-30字符，且不是需要排除的非商家名
+                if 4 <= len(clean_text) <= 30 and not is_excluded(clean_text):
+                    if debug_mode:
+                        print(f"  候选商家名: {clean_text} (字体={font_size}, Y={y1})")
 
-            # 解析bounds
-            bounds = self._parse_bounds(bounds_str)
-            if not bounds:
-                continue
+                    # 严格小于：相同字体和Y轴时保留先出现的候选
+                    key = (-font_size, y1)
+                    if best_key is None or key < best_key:
+                        best_key = key
+                        best_name = clean_text
 
-            # 关键过滤：必须在信息区域内
-            if not (zone['y_min'] <= bounds['y1'] <= zone['y_max']):
+            if info_done or not (info_min <= y1 <= info_max):
                 continue
 
             # 清理HTML
-            clean_text = re.sub(r'<[^>]+>', '', text).strip()
+            clean_text = strip_html(text).strip()
 
             # 1. 提取评分（X.X 分）
             if not info_data['rating']:
-                rating_match = re.search(r'(\d+\.\d+)\s*分', clean_text)
+                rating_match = _RE_RATING.search(clean_text)
                 if rating_match:
                     info_data['rating'] = rating_match.group(1)
                     if debug_mode:
-                        print(f"    ✓ 评分: {info_data['rating']}分 (Y={bounds['y1']})")
+                        print(f"    ✓ 评分: {info_data['rating']}分 (Y={y1})")
 
             # 2. 提取营业时间（XX:XX-XX:XX）
             if not info_data['business_hours']:
-                time_match = re.search(r'(\d{2}:\d{2}[-~]\d{2}:\d{2})', clean_text)
+                time_match = _RE_BUSINESS_HOURS.search(clean_text)
                 if time_match:
                     info_data['business_hours'] = time_match.group(1)
                     if debug_mode:
-                        print(f"    ✓ 营业时间: {info_data['business_hours']} (Y={bounds['y1']})")
+                        print(f"    ✓ 营业时间: {info_data['business_hours']} (Y={y1})")
 
             # 3. 提取地址（包含区/路/街/号，长度>10）
             if not info_data['address']:
-                if any(k in clean_text for k in ['区', '路', '街', '号', '道', '巷']):
+                if _RE_ADDRESS_HINT.search(clean_text):
                     if len(clean_text) > 10:
                         info_data['address'] = clean_text
                         if debug_mode:
-                            print(f"    ✓ 地址: {info_data['address']} (Y={bounds['y1']})")
+                            print(f"    ✓ 地址: {info_data['address']} (Y={y1})")
 
             # 4. 定位电话按钮
             if not info_data['phone_button_pos']:
                 if '电话' in clean_text or '补充电话' in clean_text:
                     info_data['phone_button_pos'] = {
-                        'x': (bounds['x1'] + bounds['x2']) // 2,
-                        'y': (bounds['y1'] + bounds['y2']) // 2
+                        'x': (x1 + x2) // 2,
+                        'y': (y1 + y2) // 2
                     }
                     if debug_mode:
-                        print(f"    ✓ 电话按钮: ({info_data['phone_button_pos']['x']}, {info_data['phone_button_pos']['y']}) (Y={bounds['y1']})")
-
-        return info_data
+                        print(f"    ✓ 电话按钮: ({info_data['phone_button_pos']['x']}, {info_data['phone_button_pos']['y']}) (Y={y1})")
 
-    def _parse_bounds(self, bounds_str: str) -> Optional[Dict]:
-        """
-        解析bounds字符串
+            info_done = bool(info_data['rating'] and info_data['business_hours'] and
+                             info_data['address'] and info_data['phone_button_pos'])
 
-        Args:
-            bounds_str: bounds字符串，格式 "[x1,y1][x2,y2]"
+        if best_name is None:
+            if debug_mode:
+                print("  ⚠ 名称区域未找到商家名")
+            info_data['name'] = "未知商家"
+        else:
+            if debug_mode:
+                print(f"  ✓ 识别商家名: {best_name} (字体={-best_key[0]}, Y={best_key[1]})")
+            info_data['name'] = best_name
 
-        Returns:
-            bounds字典 {'x1', 'y1', 'x2', 'y2', 'width', 'height'}
-        """
-        if not bounds_str:
-            return None
-
-        match = re.match(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]', bounds_str)
-        if not match:
-            return None
-
-        x1, y1, x2, y2 = map(int, match.groups())
-
-        return {
-            'x1': x1,
-            'y1': y1,
-            'x2': x2,
-            'y2': y2,
-            'width': x2 - x1,
-            'height': y2 - y1
-        }
+        return info_data
 
     def _is_excluded_name(self, text: str) -> bool:
         """
@@ -323,32 +325,16 @@ class MerchantDetailLocator:
         Returns:
             是否需要排除
         """
-        # 排除照片标签
-        if re.match(r'^照片\(\d+\)$', text):
-            return True
-        if text.startswith('照片') or '相册' in text:
-            return True
-
-        # 排除评分
-        if re.match(r'^\d+\.\d+$', text):
-            return True
-        if re.match(r'^\d+\.\d+\s*分', text):
-            return True
-
-        # 排除时间
-        if re.match(r'^\d{2}:\d{2}', text):
-            return True
-
-        # 排除营业状态
-        if text in ['营业中', '休息中', '即将营业', '已打烊', '暂停营业']:
+        # 照片标签（照片(3)、照片墙…）、评分（4.5 / 4.5分）、时间（10:00…）
+        if _RE_EXCLUDED_NAME.match(text):
             return True
 
-        # 排除页面标签
-        if text in ['入驻商家', '刚刚浏览', '达人笔记', '附近推荐', '查看全部']:
+        # 营业状态、页面标签
+        if text in _EXCLUDED_NAMES:
             return True
 
-        # 排除商品名标识
-        if '【' in text or '】' in text:
+        # 相册、商品名标识
+        if '相册' in text or '【' in text or '】' in text:
             return True
 
         return False